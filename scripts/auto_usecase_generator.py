@@ -7,35 +7,88 @@ GitHubリンクからユースケースMDファイルを自動生成する
 import os
 import sys
 import subprocess
+import selectors
 import json
+import concurrent.futures
+import threading
+import atexit
+import glob
+import hashlib
+import shutil
+import functools
+import copy
+import importlib.util
 import re
 import time
-import tempfile
-import shutil
 from datetime import datetime
-from urllib.parse import urlparse
+from urllib.parse import urljoin, urlsplit
 import argparse
+import logging
 import base64
 import getpass
 
+# 生成処理・Git操作の進行状況の出力先（main() の configure_logging で設定）
+logger = logging.getLogger("auto_usecase_generator")
+
 # 暗号化機能（オプショナル）
-try:
-    from cryptography.fernet import Fernet
+# APIキーの保存・読み込み時にのみ必要なため、起動時は存在確認だけ行い読み込みは初回利用時まで遅らせる
+HAS_CRYPTOGRAPHY = importlib.util.find_spec("cryptography") is not None
+
+@functools.lru_cache(maxsize=1)
+def _load_cryptography():
+    """cryptography を読み込み (Fernet, InvalidToken, hashes, PBKDF2HMAC) を返す（読み込みは1回のみ）"""
+    from cryptography.fernet import Fernet, InvalidToken
     from cryptography.hazmat.primitives import hashes
     from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-    HAS_CRYPTOGRAPHY = True
-except ImportError:
-    HAS_CRYPTOGRAPHY = False
+    return Fernet, InvalidToken, hashes, PBKDF2HMAC
 
-# requestsの代替として標準ライブラリを使用
+# requestsの代替として標準ライブラリを使用（http.clientは利用箇所で遅延インポート）
 try:
     import requests
     HAS_REQUESTS = True
 except ImportError:
-    import urllib.request
-    import urllib.error
     HAS_REQUESTS = False
 
+# 高速JSONライブラリ（オプショナル）
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# libgit2バインディング（オプショナル：git add/commit をプロセス起動なしで実行）
+try:
+    import pygit2
+    HAS_PYGIT2 = True
+except ImportError:
+    HAS_PYGIT2 = False
+
+def _json_dumps_bytes(data):
+    """データを整形済みJSONのUTF-8バイト列に変換（orjsonが利用可能なら使用）"""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def _json_loads(text):
+    """JSON文字列を解析（orjsonが利用可能なら使用）
+
+    orjson.JSONDecodeError は json.JSONDecodeError のサブクラスのため、
+    呼び出し側は従来通り json.JSONDecodeError を捕捉すればよい。
+    """
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# extract_clean_output 用の正規表現（モジュール読み込み時に一度だけコンパイル）
+# YAMLフロントマター / ```markdown``` / ```json``` を1回の走査で検出する
+# フェンス内の本文は自身の閉じフェンスを越えない（後続のブロックを飲み込まない）
+_CLEAN_RE = re.compile(
+    r"(?P<yaml>^---\s*\n.*?\n---\s*\n.*)"
+    r"|```markdown\s*(?P<md>(?:(?!```).)*?)\s*```"
+    r"|```(?:json)?\s*(?P<json>\{(?:(?!```).)*?\})\s*```",
+    re.DOTALL,
+)
+
 class APIKeyManager:
     """APIキーの暗号化保存・復号化を管理"""
     
@@ -43,20 +96,32 @@ class APIKeyManager:
         self.config_dir = config_dir
         self.key_file = os.path.join(config_dir, ".api_keys.enc")
         os.makedirs(config_dir, exist_ok=True)
+        # 導出済みキー（平文パスワードは保持せず、ハッシュ値と塩をキーにする）
+        self._derived_keys = {}
         
     def _derive_key(self, password: str, salt: bytes) -> bytes:
-        """パスワードから暗号化キーを導出"""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+        """パスワードから暗号化キーを導出（同一パスワード・塩の組は再計算しない）"""
+        cache_key = (hashlib.blake2b(password.encode()).digest(), salt)
+        key = self._derived_keys.get(cache_key)
+        if key is None:
+            _, _, hashes, PBKDF2HMAC = _load_cryptography()
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                iterations=100000,
+            )
+            key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+            self._derived_keys[cache_key] = key
+        return key
     
     def save_api_key(self, service: str, api_key: str, password: str):
         """APIキーを暗号化して保存"""
-        if not HAS_CRYPTOGRAPHY:
+        try:
+            if not HAS_CRYPTOGRAPHY:
+                raise ImportError("cryptography")
+            Fernet, InvalidToken, _, _ = _load_cryptography()
+        except ImportError:
             print("⚠️ 暗号化ライブラリが利用できません。'pip install cryptography' でインストールしてください")
             return False
         
@@ -64,25 +129,26 @@ class APIKeyManager:
             # 既存のキーファイルを読み込むか、新規作成
             data = {}
             salt = os.urandom(16)
+            encrypted_data = None
             
             if os.path.exists(self.key_file):
                 # 既存ファイルから塩を読み込み
                 with open(self.key_file, 'rb') as f:
                     salt = f.read(16)
                     encrypted_data = f.read()
-                
+            
+            # キー導出は1回だけ行い、復号と再暗号化で共用
+            fernet = Fernet(self._derive_key(password, salt))
+            
+            if encrypted_data is not None:
                 # 復号化して既存データを取得
-                key = self._derive_key(password, salt)
-                fernet = Fernet(key)
                 decrypted_data = fernet.decrypt(encrypted_data)
-                data = json.loads(decrypted_data.decode())
+                data = _json_loads(decrypted_data)
             
             # 新しいAPIキーを追加
             data[service] = api_key
             
             # 暗号化して保存
-            key = self._derive_key(password, salt)
-            fernet = Fernet(key)
             encrypted_data = fernet.encrypt(json.dumps(data).encode())
             
             with open(self.key_file, 'wb') as f:
@@ -92,7 +158,10 @@ class APIKeyManager:
             print(f"✅ {service} APIキーを暗号化保存しました")
             return True
             
-        except Exception as e:
+        except InvalidToken:
+            print("❌ APIキー保存エラー: パスワードが一致しないか、キーファイルが破損しています")
+            return False
+        except (OSError, ValueError, TypeError) as e:
             print(f"❌ APIキー保存エラー: {e}")
             return False
     
@@ -100,408 +169,359 @@ class APIKeyManager:
         """暗号化されたAPIキーを復号化して取得"""
         if not HAS_CRYPTOGRAPHY:
             return None
+        try:
+            Fernet, InvalidToken, _, _ = _load_cryptography()
+        except ImportError:
+            return None
         
         try:
-            if not os.path.exists(self.key_file):
-                return None
-            
             with open(self.key_file, 'rb') as f:
                 salt = f.read(16)
                 encrypted_data = f.read()
-            
+        except OSError:
+            # キーファイル未作成（FileNotFoundError）・読み込み不可
+            return None
+        
+        try:
             key = self._derive_key(password, salt)
             fernet = Fernet(key)
             decrypted_data = fernet.decrypt(encrypted_data)
-            data = json.loads(decrypted_data.decode())
-            
-            return data.get(service)
-            
-        except Exception:
+            data = _json_loads(decrypted_data)
+        except (InvalidToken, ValueError):
+            # パスワード違い・ファイル破損（JSON/UTF-8のエラーは ValueError のサブクラス）
             return None
+        
+        return data.get(service) if isinstance(data, dict) else None
     
     def has_stored_keys(self) -> bool:
         """保存されたAPIキーファイルが存在するか確認"""
         return os.path.exists(self.key_file)
 
+def _plain_info_output():
+    """進行状況を通常のテキストで表示する設定か（--quiet / --json-log 指定時は False）"""
+    if not logger.isEnabledFor(logging.INFO):
+        return False
+    return not any(isinstance(handler.formatter, _JsonLogFormatter) for handler in logger.handlers)
+
 class ProgressBar:
     """シンプルなプログレスバー表示"""
     def __init__(self, width=40):
         self.width = width
         self.current = 0
-        
-    def show(self, message="処理中"):
-        """アニメーション付きプログレス表示"""
+        # 出力がTTYでない場合（CI・リダイレクト時）や並列実行中のワーカーでは
+        # 表示が混ざるためアニメーションしない（--quiet / --json-log でも表示しない）
+        self.enabled = (sys.stdout.isatty()
+                        and threading.current_thread() is threading.main_thread()
+                        and _plain_info_output())
+        
+    def tick(self, message="処理中"):
+        """アニメーションを1フレーム表示（スリープなし）"""
+        if not self.enabled:
+            return
         chars = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
         char = chars[self.current % len(chars)]
         self.current += 1
         print(f"\r{char} {message}...", end="", flush=True)
-        time.sleep(0.1)
+    
+    def heartbeat(self, message, received_bytes, elapsed):
+        """アニメーションできない環境向けに受信状況を1行表示"""
+        if self.enabled:
+            return
+        logger.info(f"⏳ {message}: {received_bytes:,} バイト受信（経過 {elapsed:.0f}秒）")
+    
+    def start(self, message="処理中"):
+        """待機中の表示を1回だけ出力（更新用のスレッド・タイマーは使わない）
+        
+        出力を逐次読み込めないAPI呼び出し向け。CLI実行時は読み込みループから tick() を呼ぶ。
+        """
+        if not self.enabled:
+            return
+        print(f"\r⏳ {message}...", end="", flush=True)
     
     def finish(self, message="完了"):
         """プログレス完了"""
-        print(f"\r✅ {message}")
-
-def extract_clean_output(raw_output):
-    """AIの出力から主要なコンテンツ（JSONやMarkdown）を抽出・整形する"""
+        if self.enabled:
+            print(f"\r✅ {message}")
+        else:
+            logger.info(f"✅ {message}")
+
+# CLI生出力ログの書き込み用スレッド（分析処理をディスクI/Oで待たせない）
+_LOG_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="cli-log")
+atexit.register(_LOG_EXECUTOR.shutdown, wait=True)
+
+def _write_log_if_new(log_dir, filename, duplicate_pattern, parts):
+    """同一内容のログが既に存在しない場合のみ書き込む（parts はバイト列の並び、連結せずに順に書く）"""
+    if glob.glob(os.path.join(glob.escape(log_dir), duplicate_pattern)):
+        return
+    with open(os.path.join(log_dir, filename), 'wb') as f:
+        f.writelines(parts)
+
+# 段階別AI分析結果のキャッシュ有効期間（秒）
+_STAGE_CACHE_TTL = 24 * 60 * 60
+
+# AI CLI出力の保持上限（これを超えた分は破棄）
+_MAX_CAPTURE_BYTES = 8 * 1024 * 1024
+_READ_CHUNK_SIZE = 64 * 1024
+
+def _append_bounded(buf, chunk, max_bytes):
+    """上限を超えない範囲でバッファに追記"""
+    room = max_bytes - len(buf)
+    if room > 0:
+        buf += chunk[:room]
+
+class _AIResult:
+    """API呼び出し結果（CLI実行時の subprocess.CompletedProcess と同じ属性で扱う）"""
+    __slots__ = ("stdout", "stderr", "returncode")
     
-    # 1. YAMLフロントマター付きのMarkdown全体を検索（最優先）
-    md_search = re.search(r"^---\s*\n.*?\n---\s*\n.*", raw_output, re.DOTALL)
-    if md_search:
-        return md_search.group(0)
-
-    # 2. ```markdown ... ``` ブロックを検索
-    md_block_search = re.search(r"```markdown\s*(.*?)\s*```", raw_output, re.DOTALL)
-    if md_block_search:
-        return md_block_search.group(1)
-
-    # 3. ```json ... ``` ブロックを検索
-    json_search = re.search(r"```(json)?\s*(\{.*?\})\s*```", raw_output, re.DOTALL)
-    if json_search:
+    def __init__(self, stdout, stderr="", returncode=0):
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode = returncode
+
+class AnalysisCancelled(Exception):
+    """他のプロバイダーが先に成功したため分析が中断された"""
+
+# ファイル名・ログ名に使用できない文字（モジュール読み込み時に一度だけコンパイル）
+_SANITIZE_RE = re.compile(r'[^\w\-_]')
+
+def sanitize_filename(name):
+    """ファイル名に安全な文字以外を '_' に置換"""
+    return _SANITIZE_RE.sub('_', name)
+
+# 同一URLの解析結果を再利用
+_cached_urlsplit = functools.lru_cache(maxsize=256)(urlsplit)
+
+@functools.lru_cache(maxsize=256)
+def extract_repo_name(github_url):
+    """GitHubURLからリポジトリ名（owner_repo）を抽出"""
+    parsed = _cached_urlsplit(github_url)
+    path_parts = parsed.path.strip('/').split('/')
+    if len(path_parts) >= 2:
+        return f"{path_parts[0]}_{path_parts[1]}"
+    return "unknown_repo"
+
+# 参考ユースケースの相対パス（プロジェクトルート基準）
+_SAMPLE_USECASE_RELPATH = os.path.join("use-cases", "AIエージェントによるプロジェクト初期構築支援.md")
+
+def _replace_file_bytes(path, data):
+    """一時ファイルに書き込んでから置き換え（並行実行中の書き込みでも壊れたファイルを残さない）
+
+    一時ファイル名にはプロセスIDとスレッドIDを含め、同一プロセス内のワーカー同士でも衝突しないようにする。
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
         try:
-            json.loads(json_search.group(2))
-            return json_search.group(2)
-        except json.JSONDecodeError:
+            os.remove(tmp_path)
+        except OSError:
             pass
+        raise
+
+@functools.lru_cache(maxsize=8)
+def _read_text_file(path):
+    """テキストファイルを読み込み（同一パスはプロセスにつき1回だけ読む、無ければ空文字）"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return ""
 
-    # 4. JSONオブジェクトを直接検索（より包括的な検索）
-    # 複数行にわたるJSONを処理
-    lines = raw_output.split('\n')
-    json_lines = []
-    in_json = False
-    brace_count = 0
-    
-    for line in lines:
-        # JSONの開始を検出
-        if '{' in line and not in_json:
-            in_json = True
-            brace_count = line.count('{') - line.count('}')
-            json_lines.append(line)
-        elif in_json:
-            brace_count += line.count('{') - line.count('}')
-            json_lines.append(line)
-            # JSONの終了を検出
-            if brace_count <= 0:
-                break
+@functools.lru_cache(maxsize=None)
+def _which(command):
+    """コマンドの絶対パスを解決（PATH探索はプロセスにつき1回、見つからなければNone）"""
+    return shutil.which(command)
+
+# AI CLI/APIの同時呼び出し上限（バッチ並列・プロバイダー競争・Stage 3/4並列の合計）
+_MAX_CONCURRENT_AI_CALLS = 8
+_AI_CALL_SEMAPHORE = threading.BoundedSemaphore(_MAX_CONCURRENT_AI_CALLS)
+
+# 非対話環境で受信状況を表示する間隔（秒）
+_HEARTBEAT_INTERVAL = 30
+
+def _run_capture(cmd, timeout, on_tick=None, tick_interval=0.1, max_bytes=_MAX_CAPTURE_BYTES,
+                 cancel_event=None, on_heartbeat=None, heartbeat_interval=_HEARTBEAT_INTERVAL):
+    """コマンドを実行し、stdout/stderrを逐次読み込んで結果を返す
+
+    subprocess.run(capture_output=True) の代替。出力はストリームごとに
+    max_bytes まで保持し、待機中は tick_interval ごとに on_tick を呼び出す。
+    on_heartbeat を指定すると heartbeat_interval 秒ごとに (受信バイト数, 経過秒) で呼び出す。
+    timeout 秒を超えた場合はプロセスを終了し subprocess.TimeoutExpired を送出する。
+    cancel_event がセットされた場合もプロセスを終了し AnalysisCancelled を送出する。
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout_buf = bytearray()
+    stderr_buf = bytearray()
+    started = time.monotonic()
+    deadline = started + timeout
+    next_heartbeat = [started + heartbeat_interval]
     
-    if json_lines:
-        potential_json = '\n'.join(json_lines)
-        # 最初の{から最後の}までを抽出
-        start_idx = potential_json.find('{')
-        end_idx = potential_json.rfind('}') + 1
-        if start_idx != -1 and end_idx > start_idx:
-            potential_json = potential_json[start_idx:end_idx]
-            try:
-                json.loads(potential_json)
-                return potential_json
-            except json.JSONDecodeError:
-                pass
-
-    # 5. 単純なJSONオブジェクト検索（元の方法）
-    json_start = raw_output.find('{')
-    json_end = raw_output.rfind('}') + 1
-    if json_start != -1 and json_end > json_start:
-        potential_json = raw_output[json_start:json_end]
-        try:
-            json.loads(potential_json)
-            return potential_json
-        except json.JSONDecodeError:
-            pass
-
-    # 6. 何も見つからない場合は、前後の空白を除去してそのまま返す
-    return raw_output.strip()
-
-
-class MultiStageAnalyzer:
-    """高精度多段階分析エンジン（Gemini/Claude対応）"""
+    def tick():
+        if on_tick:
+            on_tick()
+        if on_heartbeat:
+            now = time.monotonic()
+            if now >= next_heartbeat[0]:
+                on_heartbeat(len(stdout_buf), now - started)
+                next_heartbeat[0] = now + heartbeat_interval
     
-    def __init__(self, github_url, repo_name, temp_dir, cli_outputs_dir, ai_provider="gemini", openai_api_key=None):
-        self.github_url = github_url
-        self.repo_name = repo_name
-        self.temp_dir = temp_dir
-        self.cli_outputs_dir = cli_outputs_dir
-        self.ai_provider = ai_provider
-        self.openai_api_key = openai_api_key
-        self.analysis_data = {}
-        self.project_root = os.path.dirname(cli_outputs_dir)
-        
-    def save_stage_data(self, stage, data):
-        """段階別データを一時保存"""
-        stage_file = os.path.join(self.temp_dir, f"stage_{stage}.json")
-        with open(stage_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    try:
+        if os.name == "nt":
+            # Windowsではパイプをselectできないため読み込みスレッドを使用
+            def drain(stream, buf):
+                for chunk in iter(lambda: stream.read1(_READ_CHUNK_SIZE), b""):
+                    _append_bounded(buf, chunk, max_bytes)
+            
+            readers = [threading.Thread(target=drain, args=(proc.stdout, stdout_buf), daemon=True),
+                       threading.Thread(target=drain, args=(proc.stderr, stderr_buf), daemon=True)]
+            for reader in readers:
+                reader.start()
+            while proc.poll() is None:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise AnalysisCancelled(cmd)
+                if time.monotonic() >= deadline:
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+                try:
+                    proc.wait(timeout=tick_interval)
+                except subprocess.TimeoutExpired:
+                    tick()
+            for reader in readers:
+                reader.join()
+        else:
+            with selectors.DefaultSelector() as selector:
+                selector.register(proc.stdout, selectors.EVENT_READ, stdout_buf)
+                selector.register(proc.stderr, selectors.EVENT_READ, stderr_buf)
+                next_tick = time.monotonic() + tick_interval
+                while selector.get_map():
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise AnalysisCancelled(cmd)
+                    now = time.monotonic()
+                    if now >= deadline:
+                        raise subprocess.TimeoutExpired(cmd, timeout)
+                    for key, _ in selector.select(min(tick_interval, deadline - now)):
+                        chunk = os.read(key.fd, _READ_CHUNK_SIZE)
+                        if chunk:
+                            _append_bounded(key.data, chunk, max_bytes)
+                        else:
+                            selector.unregister(key.fileobj)
+                    if time.monotonic() >= next_tick:
+                        tick()
+                        next_tick = time.monotonic() + tick_interval
+            proc.wait(timeout=max(0, deadline - time.monotonic()))
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        proc.stdout.close()
+        proc.stderr.close()
     
-    def load_stage_data(self, stage):
-        """段階別データを読み込み"""
-        stage_file = os.path.join(self.temp_dir, f"stage_{stage}.json")
-        if os.path.exists(stage_file):
-            with open(stage_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+    result = subprocess.CompletedProcess(
+        cmd,
+        proc.returncode,
+        stdout_buf.decode('utf-8', errors='replace'),
+        stderr_buf.decode('utf-8', errors='replace'),
+    )
+    # ログ書き込み用に受信したバイト列をそのまま保持（再エンコードを避ける）
+    result.raw_stdout = stdout_buf
+    result.raw_stderr = stderr_buf
+    return result
+
+# 括弧対応の走査で意味を持つトークン（文字列リテラルはエスケープ込みで1トークンとして読み飛ばす）
+_BRACE_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"?|[{}]', re.DOTALL)
+
+def _first_balanced_object(text):
+    """最初の '{' から括弧の対応が取れるまでの範囲 (start, end) を返す
+
+    文字列リテラル内の括弧とエスケープは無視する。対応が取れない場合は None。
+    1文字ずつのPythonループではなく、括弧と文字列リテラルの単位で辿る。
+    """
+    start = text.find('{')
+    if start == -1:
         return None
-    
-    def execute_ai_analysis(self, prompt, stage_name):
-        """AI CLIを実行して分析（Gemini/Claude）"""
-        try:
-            print(f"\n🔍 {stage_name} - {self.ai_provider.upper()}分析実行中...")
-            
-            # プログレスバー
-            progress = ProgressBar()
-            import threading
-            stop_progress = threading.Event()
-            
-            def show_progress():
-                while not stop_progress.is_set():
-                    progress.show(f"{stage_name}")
-            
-            progress_thread = threading.Thread(target=show_progress)
-            progress_thread.daemon = True
-            progress_thread.start()
-            
-            # AI CLI実行
-            if self.ai_provider == "gemini":
-                cmd = ["gemini", "chat", "--prompt", prompt]
-                timeout = 300  # 5分
-                result = subprocess.run(
-                    cmd, 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=timeout
-                )
-            elif self.ai_provider == "claude":
-                cmd = ["claude", prompt]
-                timeout = 300  # 5分
-                result = subprocess.run(
-                    cmd, 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=timeout
-                )
-            elif self.ai_provider == "chatgpt":
-                # ChatGPT API呼び出し
-                result = self._call_chatgpt_api(prompt)
-                timeout = 300  # 5分
-            else:
-                raise ValueError(f"Unsupported AI provider: {self.ai_provider}")
-            
-            stop_progress.set()
-            progress_thread.join(timeout=0.5)
-            
-            # CLIの生出力をログファイルに保存
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_stage_name = re.sub(r'[^\w\-_]', '_', stage_name)
-            raw_output_filename = f"{timestamp}_{self.repo_name}_{safe_stage_name}.log"
-            raw_output_path = os.path.join(self.cli_outputs_dir, raw_output_filename)
-            
-            log_content = f"""# AI Analysis Log
-
-- **Repository**: {self.github_url}
-- **AI Provider**: {self.ai_provider}
-- **Stage**: {stage_name}
-- **Timestamp**: {timestamp}
-
-## Prompt
-
-```
-{prompt}
-```
 
-## Raw STDOUT
+    depth = 0
+    for match in _BRACE_TOKEN_RE.finditer(text, start):
+        token = match.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0:
+                return start, match.end()
+        # それ以外は文字列リテラル（閉じられていない場合は末尾まで消費され、ループが終わる）
+    return None
+
+_JSON_DECODER = json.JSONDecoder()
+
+def _parse_json_object_span(text, start, end):
+    """text[start:end] が単一のJSONオブジェクトなら解析結果の dict を返す（それ以外は None）
+
+    '{' で始まらない候補は解析せずに除外する。標準ライブラリでは raw_decode で
+    元の文字列上をそのまま走査し、部分文字列のコピーを作らない。
+    """
+    if start >= end or text[start] != '{':
+        return None
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(text[start:end])
+        except orjson.JSONDecodeError:
+            return None
+    try:
+        parsed, parsed_end = _JSON_DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        return None
+    return parsed if parsed_end == end else None
 
-```
-{result.stdout}
-```
+def _extract_clean_output_with_data(raw_output):
+    """extract_clean_output の本体。(抽出結果, JSONの場合は検証時の解析結果・それ以外は None) を返す"""
+    
+    # 1-3. YAMLフロントマター付きMarkdown / ```markdown``` / ```json``` ブロックを一括検索
+    # 先頭のYAMLフロントマターが最優先、以降は出現順に最初に見つかったブロックを採用
+    # フロントマターは先頭一致のみ・他はフェンス必須のため、どちらも無ければ正規表現を実行しない
+    if raw_output.startswith('---') or '```' in raw_output:
+        for match in _CLEAN_RE.finditer(raw_output):
+            kind = match.lastgroup
+            if kind == "yaml":
+                return match.group(0), None
+            if kind == "md":
+                return match.group("md"), None
+            parsed = _parse_json_object_span(raw_output, match.start("json"), match.end("json"))
+            if parsed is not None:
+                return match.group("json"), parsed
+
+    # 4. 最初の対応の取れたJSONオブジェクトを1パスで検索
+    # （文字列リテラル内の括弧も正しく扱うため、行単位の括弧数え上げは行わない）
+    span = _first_balanced_object(raw_output)
+    if span:
+        parsed = _parse_json_object_span(raw_output, span[0], span[1])
+        if parsed is not None:
+            return raw_output[span[0]:span[1]], parsed
+
+    # 5. 何も見つからない場合は、前後の空白を除去してそのまま返す
+    return raw_output.strip(), None
 
-## Raw STDERR
+def extract_clean_output(raw_output):
+    """AIの出力から主要なコンテンツ（JSONやMarkdown）を抽出・整形する"""
+    return _extract_clean_output_with_data(raw_output)[0]
 
-```
-{result.stderr}
-```
-"""
-            with open(raw_output_path, 'w', encoding='utf-8') as f:
-                f.write(log_content)
 
-            if result.returncode == 0:
-                progress.finish(f"{stage_name} 完了")
-                # 整形された出力を返す
-                return extract_clean_output(result.stdout)
-            else:
-                progress.finish(f"{stage_name} 失敗")
-                # クォータエラーかどうかチェック
-                if "Quota exceeded" in result.stderr or "429" in result.stderr:
-                    print(f"⚠️ {self.ai_provider.upper()} APIクォータ制限に達しました")
-                    print(f"💡 別のAIプロバイダーを試すか、時間をおいて再実行してください")
-                else:
-                    print(f"❌ エラー: {result.stderr}")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            stop_progress.set()
-            progress.finish(f"{stage_name} タイムアウト")
-            print(f"⏰ {self.ai_provider.upper()} {stage_name} がタイムアウトしました")
-            return None
-        except Exception as e:
-            stop_progress.set()
-            progress.finish(f"{stage_name} エラー")
-            print(f"❌ {self.ai_provider.upper()} {stage_name} でエラーが発生しました: {e}")
-            return None
-    
-    def _call_chatgpt_api(self, prompt):
-        """ChatGPT APIを呼び出す"""
-        try:
-            if not self.openai_api_key:
-                raise ValueError("OpenAI API key is required for ChatGPT")
-            
-            # プロンプト長をチェック（概算）
-            prompt_length = len(prompt.split())
-            if prompt_length > 8000:  # 安全マージンを考慮
-                print(f"⚠️ プロンプトが長すぎます ({prompt_length} words). 短縮します...")
-                # プロンプトを短縮
-                prompt = prompt[:16000] + "\n\n[プロンプトが長すぎるため短縮されました]"
-            
-            data = {
-                "model": "gpt-4o",
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "max_tokens": 4000,
-                "temperature": 0.7
-            }
-            
-            print(f"🔄 ChatGPT API呼び出し中...")
-            
-            if HAS_REQUESTS:
-                # requests を使用
-                import requests
-                headers = {
-                    "Authorization": f"Bearer {self.openai_api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                response = requests.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers=headers,
-                    json=data,
-                    timeout=300
-                )
-                
-                status_code = response.status_code
-                response_text = response.text
-                
-                if status_code == 200:
-                    result_data = response.json()
-                else:
-                    result_data = None
-                    
-            else:
-                # 標準ライブラリ urllib を使用
-                import urllib.request
-                import urllib.error
-                import json
-                
-                json_data = json.dumps(data).encode('utf-8')
-                
-                req = urllib.request.Request(
-                    "https://api.openai.com/v1/chat/completions",
-                    data=json_data,
-                    headers={
-                        "Authorization": f"Bearer {self.openai_api_key}",
-                        "Content-Type": "application/json"
-                    }
-                )
-                
-                try:
-                    with urllib.request.urlopen(req, timeout=300) as response:
-                        status_code = response.getcode()
-                        response_text = response.read().decode('utf-8')
-                        result_data = json.loads(response_text) if status_code == 200 else None
-                except urllib.error.HTTPError as e:
-                    status_code = e.code
-                    response_text = e.read().decode('utf-8')
-                    result_data = None
-                except urllib.error.URLError as e:
-                    raise Exception(f"Network error: {e}")
-            
-            # 共通のレスポンス処理
-            class MockResult:
-                def __init__(self, stdout, stderr="", returncode=0):
-                    self.stdout = stdout
-                    self.stderr = stderr
-                    self.returncode = returncode
-            
-            if status_code == 200:
-                try:
-                    if result_data and 'choices' in result_data and len(result_data['choices']) > 0:
-                        content = result_data['choices'][0]['message']['content']
-                        print(f"✅ ChatGPT API呼び出し成功")
-                        return MockResult(content)
-                    else:
-                        error_msg = "ChatGPT API response has no choices"
-                        print(f"❌ {error_msg}")
-                        return MockResult("", error_msg, 1)
-                        
-                except (KeyError, IndexError) as e:
-                    error_msg = f"ChatGPT API response format error: {e}"
-                    print(f"❌ {error_msg}")
-                    return MockResult("", error_msg, 1)
-                    
-            elif status_code == 401:
-                error_msg = "ChatGPT API authentication failed. Please check your API key."
-                print(f"❌ {error_msg}")
-                return MockResult("", error_msg, 1)
-                
-            elif status_code == 429:
-                error_msg = "ChatGPT API rate limit exceeded. Please wait and try again."
-                print(f"❌ {error_msg}")
-                return MockResult("", error_msg, 1)
-                
-            elif status_code == 400:
-                try:
-                    import json
-                    error_data = json.loads(response_text)
-                    error_detail = error_data.get('error', {}).get('message', 'Unknown error')
-                    error_msg = f"ChatGPT API bad request: {error_detail}"
-                except:
-                    error_msg = f"ChatGPT API bad request: {response_text}"
-                print(f"❌ {error_msg}")
-                return MockResult("", error_msg, 1)
-                
-            else:
-                error_msg = f"ChatGPT API error: {status_code} - {response_text}"
-                print(f"❌ {error_msg}")
-                return MockResult("", error_msg, 1)
-                
-        except Exception as e:
-            error_msg = f"ChatGPT API unexpected error: {str(e)}"
-            print(f"❌ {error_msg}")
-            
-            class MockResult:
-                def __init__(self, stdout, stderr="", returncode=0):
-                    self.stdout = stdout
-                    self.stderr = stderr
-                    self.returncode = returncode
-            
-            return MockResult("", error_msg, 1)
-    
-    def stage_1_basic_analysis(self):
-        """Stage 1: 基本情報収集"""
-        
-        if self.ai_provider == "chatgpt":
-            # ChatGPT用の修正されたプロンプト（リポジトリアクセス不要）
-            prompt = f"""
+# 段階別分析プロンプトのテンプレート（str.format で動的な値のみ埋め込む）
+_STAGE1_CHATGPT_PROMPT_TMPL = """
 以下のGitHubリポジトリ情報に基づいて、合理的な推測でJSON形式の基本情報を生成してください。
 
 ## リポジトリ情報
-- URL: {self.github_url}
-- 名前: {self.repo_name}
+- URL: {github_url}
+- 名前: {repo_name}
 
 注意：実際のリポジトリにアクセスできません。リポジトリ名とURLから推測できる内容で、技術プロジェクトとして適切な情報を生成してください。
 
 重要：必ずJSONのみで回答し、説明や追加テキストは含めないでください。
 
 {{
-  "repository_name": "{self.repo_name}",
+  "repository_name": "{repo_name}",
   "description": "[リポジトリ名から推測される説明]",
   "main_purpose": "[推測される主な目的]",
   "tech_stack": {{
@@ -521,11 +541,10 @@ class MultiStageAnalyzer:
   "contributors": ["[推測されるコントリビューター]"],
   "license": "[推測されるライセンス]"
 }}
-            """
-        else:
-            # Claude/Gemini用の元のプロンプト
-            prompt = f"""
-GitHubリポジトリ {self.github_url} を分析して、以下のJSON形式で回答してください。
+"""
+
+_STAGE1_PROMPT_TMPL = """
+GitHubリポジトリ {github_url} を分析して、以下のJSON形式で回答してください。
 
 重要：必ずJSONのみで回答し、説明や追加テキストは含めないでください。
 
@@ -550,58 +569,19 @@ GitHubリポジトリ {self.github_url} を分析して、以下のJSON形式で
   "contributors": ["コントリビューター1", "コントリビューター2"],
   "license": "ライセンス名"
 }}
-            """
-        
-        result = self.execute_ai_analysis(prompt, "Stage 1: 基本情報収集")
-        if result:
-            try:
-                # JSONデータを抽出
-                json_data = json.loads(result)
-                self.save_stage_data("1_basic", json_data)
-                return json_data
-            except json.JSONDecodeError:
-                print("⚠️ Stage 1 JSON解析エラー、フォールバック用データを生成")
-                # フォールバック用の基本データを生成
-                fallback_data = {
-                    "repository_name": self.repo_name,
-                    "description": "GitHub repository analysis",
-                    "main_purpose": "Code repository",
-                    "tech_stack": {
-                        "languages": ["Unknown"],
-                        "frameworks": ["Unknown"],
-                        "libraries": ["Unknown"]
-                    },
-                    "file_structure": {
-                        "key_directories": ["Unknown"],
-                        "important_files": ["Unknown"]
-                    },
-                    "documentation": {
-                        "has_readme": True,
-                        "readme_quality": "Unknown",
-                        "other_docs": ["Unknown"]
-                    },
-                    "contributors": ["Unknown"],
-                    "license": "Unknown"
-                }
-                self.save_stage_data("1_basic", fallback_data)
-                self.save_stage_data("1_basic_raw", {"raw_output": result})
-                print("✅ フォールバックデータを使用してStage 2に継続")
-                return fallback_data
-        return None
-    
-    def stage_2_deep_code_analysis(self):
-        """Stage 2: 詳細コード分析"""
-        stage1_data = self.load_stage_data("1_basic")
-        
-        if not stage1_data:
-            print("⚠️ Stage 1データが利用できません。Stage 2をスキップします。")
-            return None
-        
-        prompt = f"""
-リポジトリ {self.github_url} のコードを詳細に分析してください。
+"""
+
+_STAGE1_INDICATORS_SECTION_TMPL = """
+## 事前検出済みのファイル（GitHub Tree APIより取得）
+以下はリポジトリ内で実際に確認できた主要ファイルです。tech_stack と file_structure の判断に利用してください。
+pre_detected_indicators: {indicators}
+"""
+
+_STAGE2_PROMPT_TMPL = """
+リポジトリ {github_url} のコードを詳細に分析してください。
 
 ## Stage 1で得られた基本情報：
-{json.dumps(stage1_data, ensure_ascii=False, indent=2)}
+{stage1}
 
 ## 詳細分析項目：
 1. コードの品質・構造分析
@@ -649,69 +629,16 @@ GitHubリポジトリ {self.github_url} を分析して、以下のJSON形式で
 ```
 
 詳細なコード分析を実行してください。
-        """
-        
-        result = self.execute_ai_analysis(prompt, "Stage 2: 詳細コード分析")
-        if result:
-            try:
-                json_data = json.loads(result)
-                self.save_stage_data("2_deep_analysis", json_data)
-                return json_data
-            except json.JSONDecodeError:
-                print("⚠️ Stage 2 JSON解析エラー、フォールバック用データを生成")
-                fallback_data = {
-                    "code_quality": {
-                        "overall_rating": "普通",
-                        "code_style": "Unknown",
-                        "documentation": "Unknown"
-                    },
-                    "architecture": {
-                        "pattern": "Unknown",
-                        "design_principles": ["Unknown"],
-                        "modularity": "Unknown"
-                    },
-                    "testing": {
-                        "has_tests": False,
-                        "test_coverage": "Unknown",
-                        "test_quality": "Unknown"
-                    },
-                    "security": {
-                        "security_practices": ["Unknown"],
-                        "potential_risks": ["Unknown"]
-                    },
-                    "performance": {
-                        "optimization_level": "Unknown",
-                        "bottlenecks": ["Unknown"]
-                    },
-                    "maintainability": {
-                        "code_complexity": "Unknown",
-                        "extensibility": "Unknown",
-                        "refactoring_needs": ["Unknown"]
-                    }
-                }
-                self.save_stage_data("2_deep_analysis", fallback_data)
-                self.save_stage_data("2_deep_analysis_raw", {"raw_output": result})
-                print("✅ フォールバックデータを使用してStage 3に継続")
-                return fallback_data
-        return None
-    
-    def stage_3_consistency_check(self):
-        """Stage 3: 整合性チェックと補完"""
-        stage1_data = self.load_stage_data("1_basic")
-        stage2_data = self.load_stage_data("2_deep_analysis")
-        
-        if not stage1_data or not stage2_data:
-            print("⚠️ 前段階のデータが不足しています。Stage 3をスキップします。")
-            return None
-        
-        prompt = f"""
+"""
+
+_STAGE3_PROMPT_TMPL = """
 これまでの分析結果の整合性をチェックし、不足情報を補完してください。
 
 ## Stage 1 基本情報：
-{json.dumps(stage1_data, ensure_ascii=False, indent=2)}
+{stage1}
 
 ## Stage 2 詳細分析：
-{json.dumps(stage2_data, ensure_ascii=False, indent=2)}
+{stage2}
 
 ## チェック・補完項目：
 1. 情報の整合性確認
@@ -753,70 +680,18 @@ GitHubリポジトリ {self.github_url} を分析して、以下のJSON形式で
 ```
 
 詳細な整合性チェックと補完を実行してください。
-        """
-        
-        result = self.execute_ai_analysis(prompt, "Stage 3: 整合性チェック")
-        if result:
-            try:
-                json_data = json.loads(result)
-                self.save_stage_data("3_consistency", json_data)
-                return json_data
-            except json.JSONDecodeError:
-                print("⚠️ Stage 3 JSON解析エラー、フォールバック用データを生成")
-                fallback_data = {
-                    "consistency_check": {
-                        "data_consistency": "普通",
-                        "contradictions": ["Unknown"],
-                        "missing_info": ["Unknown"]
-                    },
-                    "ai_ml_usage": {
-                        "uses_ai_ml": False,
-                        "ai_technologies": ["Unknown"],
-                        "ml_frameworks": ["Unknown"],
-                        "ai_applications": ["Unknown"]
-                    },
-                    "business_value": {
-                        "target_users": ["Unknown"],
-                        "business_problems": ["Unknown"],
-                        "value_proposition": "Unknown",
-                        "market_potential": "Unknown"
-                    },
-                    "competitive_advantage": {
-                        "unique_features": ["Unknown"],
-                        "differentiation": "Unknown",
-                        "innovation_level": "Unknown"
-                    },
-                    "improvement_suggestions": ["Unknown"]
-                }
-                self.save_stage_data("3_consistency", fallback_data)
-                self.save_stage_data("3_consistency_raw", {"raw_output": result})
-                print("✅ フォールバックデータを使用してStage 4に継続")
-                return fallback_data
-        return None
-    
-    def stage_4_deep_insights(self):
-        """Stage 4: ディープ分析・洞察"""
-        stage1_data = self.load_stage_data("1_basic")
-        stage2_data = self.load_stage_data("2_deep_analysis")
-        stage3_data = self.load_stage_data("3_consistency")
-        
-        if not all([stage1_data, stage2_data, stage3_data]):
-            print("⚠️ 前段階のデータが不足しています。Stage 4をスキップします。")
-            return None
-        
-        prompt = f"""
+"""
+
+_STAGE4_PROMPT_TMPL = """
 これまでの全分析結果を統合し、深い洞察と戦略的視点を提供してください。
 
 ## 統合データ：
 ### Stage 1 基本情報：
-{json.dumps(stage1_data, ensure_ascii=False, indent=2)}
+{stage1}
 
 ### Stage 2 詳細分析：
-{json.dumps(stage2_data, ensure_ascii=False, indent=2)}
-
-### Stage 3 整合性・補完：
-{json.dumps(stage3_data, ensure_ascii=False, indent=2)}
-
+{stage2}
+{stage3_section}
 ## 深い洞察項目：
 1. 技術的革新性と将来性
 2. 実装の複雑さと実現可能性
@@ -873,83 +748,22 @@ GitHubリポジトリ {self.github_url} を分析して、以下のJSON形式で
 ```
 
 深い洞察と分析を提供してください。
-        """
-        
-        result = self.execute_ai_analysis(prompt, "Stage 4: ディープ分析")
-        if result:
-            try:
-                json_data = json.loads(result)
-                self.save_stage_data("4_deep_insights", json_data)
-                return json_data
-            except json.JSONDecodeError:
-                print("⚠️ Stage 4 JSON解析エラー、フォールバック用データを生成")
-                fallback_data = {
-                    "innovation_analysis": {
-                        "innovation_level": "5",
-                        "future_potential": "普通",
-                        "technology_maturity": "普通",
-                        "adoption_barriers": ["Unknown"]
-                    },
-                    "implementation_complexity": {
-                        "complexity_rating": "5",
-                        "development_time": "Unknown",
-                        "required_expertise": ["Unknown"],
-                        "infrastructure_needs": ["Unknown"]
-                    },
-                    "scalability_performance": {
-                        "scalability_potential": "普通",
-                        "performance_bottlenecks": ["Unknown"],
-                        "optimization_opportunities": ["Unknown"]
-                    },
-                    "risk_analysis": {
-                        "technical_risks": ["Unknown"],
-                        "business_risks": ["Unknown"],
-                        "mitigation_strategies": ["Unknown"]
-                    },
-                    "roi_analysis": {
-                        "investment_level": "普通",
-                        "expected_returns": "Unknown",
-                        "payback_period": "Unknown",
-                        "cost_benefit_ratio": "Unknown"
-                    },
-                    "application_potential": {
-                        "other_industries": ["Unknown"],
-                        "extension_possibilities": ["Unknown"],
-                        "ecosystem_impact": "Unknown"
-                    },
-                    "industry_alignment": {
-                        "current_trends": ["Unknown"],
-                        "market_timing": "普通",
-                        "competitive_landscape": "Unknown"
-                    }
-                }
-                self.save_stage_data("4_deep_insights", fallback_data)
-                self.save_stage_data("4_deep_insights_raw", {"raw_output": result})
-                print("✅ フォールバックデータを使用してStage 5に継続")
-                return fallback_data
-        return None
-    
-    def stage_5_final_synthesis(self):
-        """Stage 5: 最終統合・MDドキュメント生成"""
-        # 全段階のデータを読み込み
-        stage1_data = self.load_stage_data("1_basic")
-        stage2_data = self.load_stage_data("2_deep_analysis")
-        stage3_data = self.load_stage_data("3_consistency")
-        stage4_data = self.load_stage_data("4_deep_insights")
-        
-        # 既存の良いサンプルを参考例として読み込み
-        sample_usecase = self._load_sample_usecase()
-        template = self._load_template()
-        
-        prompt = f"""
+"""
+
+_STAGE4_STAGE3_SECTION_TMPL = """
+### Stage 3 整合性・補完：
+{stage3}
+"""
+
+_STAGE5_PROMPT_TMPL = """
 あなたはAIユースケース分析の専門家です。GitHubリポジトリを分析して、高品質なユースケースドキュメントを作成してください。
 
 ## 分析対象
-- **リポジトリ**: {self.github_url}
-- **プロジェクト名**: {self.repo_name}
+- **リポジトリ**: {github_url}
+- **プロジェクト名**: {repo_name}
 
 ## 利用可能な分析データ
-{self._format_analysis_data_for_prompt(stage1_data, stage2_data, stage3_data, stage4_data)}
+{analysis_data}
 
 ## 参考フォーマット（良いサンプル）
 {sample_usecase}
@@ -963,10 +777,10 @@ title: "[具体的で分かりやすいプロジェクトタイトル]"
 summary: "[1-2文の簡潔で的確な概要]"
 category: "[適切なカテゴリ：AIユースケース/Web開発/データ分析/モバイルアプリ/ツール/ライブラリ/その他]"
 industry: "[対象業界：IT・ソフトウェア/製造業/金融/ヘルスケア/教育/エンタメ/その他]"
-createdAt: {datetime.now().strftime('%Y-%m-%d')}
-updatedAt: {datetime.now().strftime('%Y-%m-%d')}
+createdAt: {today}
+updatedAt: {today}
 status: "[開発中/完了/実験的/アーカイブ/メンテナンス中]"
-github_link: {self.github_url}
+github_link: {github_url}
 contributors:
   - "[実際のコントリビューター名]"
 tags:
@@ -1002,70 +816,792 @@ AI自動生成ドキュメント
 - テンプレート的な汎用表現の多用
 
 完全で高品質なMarkdownドキュメントを生成してください。
+"""
+
+# 高速単発分析のプロンプト（全プロバイダー共通、str.format で動的な値のみ埋め込む）
+_FAST_PROMPT_TMPL = """
+あなたはAIユースケース分析の専門家です。
+
+## 対象リポジトリ情報
+- **URL**: {github_url}
+- **リポジトリ名**: {repo_name}
+
+注意：あなたは直接リポジトリにアクセスできません。以下のガイドラインに従って、リポジトリ名とURLから推測できる内容と、一般的なベストプラクティスに基づいてユースケースドキュメントを生成してください。
+
+## 参考フォーマット（良い例）
+{sample_usecase}
+
+## ドキュメント生成指示
+
+以下の形式で完全なMarkdownドキュメントを生成してください：
+
+```yaml
+---
+title: "[{repo_name}に基づく具体的なプロジェクトタイトル]"
+summary: "[1-2文の簡潔で的確な概要]"
+category: "[適切なカテゴリ：AIユースケース/Web開発/データ分析/モバイルアプリ/ツール/ライブラリ/その他]"
+industry: "[対象業界：IT・ソフトウェア/製造業/金融/ヘルスケア/教育/エンタメ/その他]"
+createdAt: {today}
+updatedAt: {today}
+status: "[開発中/完了/実験的/アーカイブ/メンテナンス中]"
+github_link: {github_url}
+contributors:
+  - "[推測されるコントリビューター名またはプレースホルダー]"
+tags:
+  - "[主要技術タグ1]"
+  - "[主要技術タグ2]"
+  - "[主要技術タグ3]"
+---
+
+<!-- 
+AI自動生成ドキュメント
+生成後にユーザーが内容を確認し、必要に応じて手動で編集・整理することを推奨します。
+特にプロジェクト固有の詳細情報や最新の開発状況については、適宜更新してください。
+-->
+```
+
+## 必須セクション（この順序で）：
+1. # [プロジェクトタイトル]
+2. ## 概要
+3. ## 課題・ニーズ  
+4. ## AI技術（AI/ML使用時）または ## 技術スタック
+5. ## 実装フロー
+6. ## 主要機能
+7. ## 技術的詳細
+8. ## 期待される効果
+9. ## リスク・課題
+10. ## 応用・展開可能性
+11. ## コントリビューター
+12. ## 参考リンク
+
+## 重要な指示：
+- リポジトリに直接アクセスできないことを前提として作成
+- リポジトリ名から推測される内容で合理的なドキュメントを作成
+- プレースホルダーや一般的な説明は避け、具体的で有用な内容を記述
+- 「分析中」「確認が必要」などの不完全な表現は使用しない
+- 完全で読みやすいMarkdownドキュメントを生成
+
+完全で高品質なMarkdownドキュメントを生成してください。
+"""
+
+# JSON解析に失敗した場合に各Stageで使用するフォールバックデータ（使用時に deepcopy して変更可能にする）
+_STAGE1_FALLBACK = {
+    "repository_name": None,  # 実行時にリポジトリ名を設定
+    "description": "GitHub repository analysis",
+    "main_purpose": "Code repository",
+    "tech_stack": {
+        "languages": ["Unknown"],
+        "frameworks": ["Unknown"],
+        "libraries": ["Unknown"]
+    },
+    "file_structure": {
+        "key_directories": ["Unknown"],
+        "important_files": ["Unknown"]
+    },
+    "documentation": {
+        "has_readme": True,
+        "readme_quality": "Unknown",
+        "other_docs": ["Unknown"]
+    },
+    "contributors": ["Unknown"],
+    "license": "Unknown"
+}
+
+_STAGE2_FALLBACK = {
+    "code_quality": {
+        "overall_rating": "普通",
+        "code_style": "Unknown",
+        "documentation": "Unknown"
+    },
+    "architecture": {
+        "pattern": "Unknown",
+        "design_principles": ["Unknown"],
+        "modularity": "Unknown"
+    },
+    "testing": {
+        "has_tests": False,
+        "test_coverage": "Unknown",
+        "test_quality": "Unknown"
+    },
+    "security": {
+        "security_practices": ["Unknown"],
+        "potential_risks": ["Unknown"]
+    },
+    "performance": {
+        "optimization_level": "Unknown",
+        "bottlenecks": ["Unknown"]
+    },
+    "maintainability": {
+        "code_complexity": "Unknown",
+        "extensibility": "Unknown",
+        "refactoring_needs": ["Unknown"]
+    }
+}
+
+_STAGE3_FALLBACK = {
+    "consistency_check": {
+        "data_consistency": "普通",
+        "contradictions": ["Unknown"],
+        "missing_info": ["Unknown"]
+    },
+    "ai_ml_usage": {
+        "uses_ai_ml": False,
+        "ai_technologies": ["Unknown"],
+        "ml_frameworks": ["Unknown"],
+        "ai_applications": ["Unknown"]
+    },
+    "business_value": {
+        "target_users": ["Unknown"],
+        "business_problems": ["Unknown"],
+        "value_proposition": "Unknown",
+        "market_potential": "Unknown"
+    },
+    "competitive_advantage": {
+        "unique_features": ["Unknown"],
+        "differentiation": "Unknown",
+        "innovation_level": "Unknown"
+    },
+    "improvement_suggestions": ["Unknown"]
+}
+
+_STAGE4_FALLBACK = {
+    "innovation_analysis": {
+        "innovation_level": "5",
+        "future_potential": "普通",
+        "technology_maturity": "普通",
+        "adoption_barriers": ["Unknown"]
+    },
+    "implementation_complexity": {
+        "complexity_rating": "5",
+        "development_time": "Unknown",
+        "required_expertise": ["Unknown"],
+        "infrastructure_needs": ["Unknown"]
+    },
+    "scalability_performance": {
+        "scalability_potential": "普通",
+        "performance_bottlenecks": ["Unknown"],
+        "optimization_opportunities": ["Unknown"]
+    },
+    "risk_analysis": {
+        "technical_risks": ["Unknown"],
+        "business_risks": ["Unknown"],
+        "mitigation_strategies": ["Unknown"]
+    },
+    "roi_analysis": {
+        "investment_level": "普通",
+        "expected_returns": "Unknown",
+        "payback_period": "Unknown",
+        "cost_benefit_ratio": "Unknown"
+    },
+    "application_potential": {
+        "other_industries": ["Unknown"],
+        "extension_possibilities": ["Unknown"],
+        "ecosystem_impact": "Unknown"
+    },
+    "industry_alignment": {
+        "current_trends": ["Unknown"],
+        "market_timing": "普通",
+        "competitive_landscape": "Unknown"
+    }
+}
+
+# Stage 3の矛盾点リストのうち、プロンプト例やフォールバックの値（実際の矛盾ではない）
+_PLACEHOLDER_CONTRADICTION_RE = re.compile(r"^(?:矛盾点\d*|なし|特になし|Unknown|None|N/A)$", re.IGNORECASE)
+
+def _has_contradictions(stage3_data):
+    """Stage 3の整合性チェックで実際の矛盾点が報告されているか"""
+    if not isinstance(stage3_data, dict):
+        return False
+    check = stage3_data.get("consistency_check")
+    contradictions = check.get("contradictions") if isinstance(check, dict) else None
+    if not isinstance(contradictions, list):
+        return False
+    return any(isinstance(item, str) and item.strip() and not _PLACEHOLDER_CONTRADICTION_RE.match(item.strip())
+               for item in contradictions)
+
+class MultiStageAnalyzer:
+    """高精度多段階分析エンジン（Gemini/Claude対応）"""
+    
+    def __init__(self, github_url, repo_name, temp_dir, cli_outputs_dir, ai_provider="gemini", openai_api_key=None,
+                 pre_detected_indicators=None, cancel_event=None, cache_salt=None, cache_mode="use"):
+        self.github_url = github_url
+        self.repo_name = repo_name
+        self.temp_dir = temp_dir
+        self.cli_outputs_dir = cli_outputs_dir
+        self.ai_provider = ai_provider
+        self.openai_api_key = openai_api_key
+        # GitHub Tree APIで事前検出したファイル一覧（Stage 1プロンプトに埋め込む）
+        self.pre_detected_indicators = pre_detected_indicators
+        # 自動選択モードで他のプロバイダーが先に成功した場合にセットされる
+        self.cancel_event = cancel_event
+        # 段階キャッシュの制御（cache_salt: リモートHEADのSHAなど / cache_mode: use・refresh・off）
+        self.cache_salt = cache_salt
+        self.cache_mode = cache_mode
+        self.analysis_data = {}
+        # カレントディレクトリに依存しないよう絶対パスで保持
+        self.project_root = os.path.dirname(os.path.abspath(cli_outputs_dir))
+        # 段階別データのJSON文字列キャッシュ（プロンプト埋め込み用）
+        self._serialized_cache = {}
+        # 出力抽出時に解析済みのJSON（stage_slug → dict、各Stageでの再解析を省略）
+        self._parsed_outputs = {}
+        # 実行をまたいで再利用する段階別AI分析結果のキャッシュ
+        self.stage_cache_dir = os.path.join(self.project_root, ".cache", "stages")
+        # ログファイル名のタイムスタンプは実行単位で共通（同一実行のログが並んでソートされる）
+        self._ts_prefix = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # ChatGPT API用のHTTPセッション（初回呼び出し時に生成し、全段階で接続を再利用）
+        self._http_session = None
+        self._http_session_lock = threading.Lock()
+        # requests が無い場合の http.client 接続（スレッドごとに1本、close() でまとめて閉じる）
+        self._openai_local = threading.local()
+        self._openai_conns = set()
+        
+    def _get_http_session(self):
+        """keep-alive で接続を再利用する requests.Session を返す（Stage 3/4の並列呼び出しに対応）"""
+        with self._http_session_lock:
+            if self._http_session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4)
+                session.mount("https://", adapter)
+                self._http_session = session
+            return self._http_session
+    
+    def _openai_post_stdlib(self, path, body, headers):
+        """標準ライブラリでOpenAI APIにPOSTリクエスト（接続を再利用）
+
+        戻り値は (status, body)。POSTは再送すると二重に実行（課金）されるため、
+        再利用したkeep-alive接続が切断されていた場合のみ、新しい接続で1回だけ再送する。
+        """
+        import http.client
+        
+        while True:
+            conn = getattr(self._openai_local, "conn", None)
+            if conn is None:
+                conn = self._openai_local.conn = http.client.HTTPSConnection("api.openai.com", timeout=300)
+            # 以前のリクエストで接続済みのソケットを使う場合のみ再送の対象
+            reused = conn.sock is not None
+            # close() 後に自動で再接続した場合も閉じられるよう毎回登録
+            with self._http_session_lock:
+                self._openai_conns.add(conn)
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, ConnectionError):
+                conn.close()
+                self._openai_local.conn = None
+                with self._http_session_lock:
+                    self._openai_conns.discard(conn)
+                if not reused:
+                    raise
+    
+    def close(self):
+        """HTTPセッション・接続を閉じる"""
+        with self._http_session_lock:
+            if self._http_session is not None:
+                self._http_session.close()
+                self._http_session = None
+            for conn in self._openai_conns:
+                conn.close()
+            self._openai_conns.clear()
+        
+    def _parse_stage_output(self, stage_slug, result):
+        """Stageの出力をJSONとして解析（抽出時に解析済みならその結果を使う）"""
+        parsed = self._parsed_outputs.pop(stage_slug, None)
+        if parsed is None:
+            parsed = _json_loads(result)
+        return parsed
+    
+    def save_stage_data(self, stage, data):
+        """段階別データを一時保存（バイト列のまま書き込み、文字列はプロンプト用に保持）"""
+        payload = _json_dumps_bytes(data)
+        self._serialized_cache[stage] = payload.decode('utf-8')
+        stage_file = os.path.join(self.temp_dir, f"stage_{stage}.json")
+        with open(stage_file, 'wb') as f:
+            f.write(payload)
+    
+    def load_stage_data(self, stage):
+        """段階別データを読み込み"""
+        stage_file = os.path.join(self.temp_dir, f"stage_{stage}.json")
+        try:
+            with open(stage_file, 'rb') as f:
+                return _json_loads(f.read())
+        except FileNotFoundError:
+            return None
+    
+    def load_stage_data_serialized(self, stage):
+        """段階別データをJSON文字列として取得（キャッシュ優先）"""
+        serialized = self._serialized_cache.get(stage)
+        if serialized is None:
+            stage_file = os.path.join(self.temp_dir, f"stage_{stage}.json")
+            if not os.path.exists(stage_file):
+                return None
+            with open(stage_file, 'r', encoding='utf-8') as f:
+                serialized = f.read()
+            self._serialized_cache[stage] = serialized
+        return serialized
+    
+    def _stage_cache_path(self, prompt, stage_name):
+        """プロバイダー・段階・プロンプトから段階キャッシュのパスを決定"""
+        key_source = f"{self.ai_provider}|{stage_name}|{prompt}"
+        if self.cache_salt:
+            key_source = f"{self.cache_salt}|{key_source}"
+        key = hashlib.sha256(key_source.encode('utf-8')).hexdigest()[:24]
+        return os.path.join(self.stage_cache_dir, f"{key}.txt")
+    
+    def _read_stage_cache(self, cache_path):
+        """有効期間内の段階キャッシュを読み込み（なければNone）"""
+        if self.cache_mode != "use":
+            return None
+        try:
+            if time.time() - os.path.getmtime(cache_path) > _STAGE_CACHE_TTL:
+                return None
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _write_stage_cache(self, cache_path, content):
+        """段階キャッシュを書き込み（一時ファイル経由で置き換え）"""
+        if self.cache_mode == "off":
+            return
+        try:
+            os.makedirs(self.stage_cache_dir, exist_ok=True)
+            _replace_file_bytes(cache_path, content.encode('utf-8'))
+        except OSError:
+            pass
+    
+    def execute_ai_analysis(self, prompt, stage_name, stage_slug=None):
+        """AI CLIを実行して分析（Gemini/Claude）
+
+        stage_slug はログファイル名に使う英数字の識別子（省略時は stage_name から生成）。
+        """
+        # 同一プロンプトの分析結果がキャッシュにあればAI呼び出しを省略
+        if self._cancelled():
+            return None
+        if stage_slug is not None:
+            self._parsed_outputs.pop(stage_slug, None)
+        
+        cache_path = self._stage_cache_path(prompt, stage_name)
+        cached = self._read_stage_cache(cache_path)
+        if cached is not None:
+            logger.info(f"\n♻️ {stage_name} - キャッシュ済みの分析結果を使用します")
+            return cached
+        
+        try:
+            logger.info(f"\n🔍 {stage_name} - {self.ai_provider.upper()}分析実行中...")
+            
+            # プログレスバー（CLI実行中は出力待ちのループから更新）
+            progress = ProgressBar()
+            
+            def on_tick():
+                progress.tick(stage_name)
+            
+            def on_heartbeat(received_bytes, elapsed):
+                progress.heartbeat(stage_name, received_bytes, elapsed)
+            
+            # AI CLI実行
+            with _AI_CALL_SEMAPHORE:
+                if self.ai_provider == "gemini":
+                    cmd = [_which("gemini") or "gemini", "chat", "--prompt", prompt]
+                    timeout = 300  # 5分
+                    result = _run_capture(cmd, timeout, on_tick=on_tick, cancel_event=self.cancel_event,
+                                          on_heartbeat=on_heartbeat)
+                elif self.ai_provider == "claude":
+                    cmd = [_which("claude") or "claude", prompt]
+                    timeout = 300  # 5分
+                    result = _run_capture(cmd, timeout, on_tick=on_tick, cancel_event=self.cancel_event,
+                                          on_heartbeat=on_heartbeat)
+                elif self.ai_provider == "chatgpt":
+                    # ChatGPT API呼び出し
+                    progress.start(stage_name)
+                    result = self._call_chatgpt_api(prompt)
+                    timeout = 300  # 5分
+                else:
+                    raise ValueError(f"Unsupported AI provider: {self.ai_provider}")
+            
+            # CLIの生出力をログファイルに保存
+            # （ファイル名に内容のハッシュを含め、同一内容の再実行ではスキップ）
+            timestamp = self._ts_prefix
+            if stage_slug is None:
+                stage_slug = sanitize_filename(stage_name)
+            # CLI実行時は受信したバイト列をそのまま使用（ChatGPT APIの結果は文字列のみ）
+            prompt_bytes = prompt.encode('utf-8')
+            raw_stdout = getattr(result, 'raw_stdout', None)
+            if raw_stdout is None:
+                raw_stdout = result.stdout.encode('utf-8')
+            raw_stderr = getattr(result, 'raw_stderr', None)
+            if raw_stderr is None:
+                raw_stderr = result.stderr.encode('utf-8')
+            content_hash = hashlib.blake2b(digest_size=16)
+            for part in (prompt_bytes, raw_stdout, raw_stderr):
+                content_hash.update(part)
+            log_suffix = f"{self.repo_name}_{stage_slug}_{content_hash.hexdigest()}.log"
+            raw_output_filename = f"{timestamp}_{log_suffix}"
+            
+            log_header = f"""# AI Analysis Log
+
+- **Repository**: {self.github_url}
+- **AI Provider**: {self.ai_provider}
+- **Stage**: {stage_name}
+- **Timestamp**: {timestamp}
+
+## Prompt
+
+```
+"""
+            log_parts = (
+                log_header.encode('utf-8'), prompt_bytes,
+                b"\n```\n\n## Raw STDOUT\n\n```\n", raw_stdout,
+                b"\n```\n\n## Raw STDERR\n\n```\n", raw_stderr,
+                b"\n```\n",
+            )
+            _LOG_EXECUTOR.submit(_write_log_if_new, self.cli_outputs_dir, raw_output_filename,
+                                 f"*_{glob.escape(log_suffix)}", log_parts)
+
+            if result.returncode == 0:
+                progress.finish(f"{stage_name} 完了")
+                # 整形された出力をキャッシュして返す（JSON検証時の解析結果は各Stageで再利用）
+                output, parsed = _extract_clean_output_with_data(result.stdout)
+                if parsed is not None:
+                    self._parsed_outputs[stage_slug] = parsed
+                if output:
+                    self._write_stage_cache(cache_path, output)
+                return output
+            else:
+                progress.finish(f"{stage_name} 失敗")
+                # クォータエラーかどうかチェック
+                if "Quota exceeded" in result.stderr or "429" in result.stderr:
+                    logger.warning(f"⚠️ {self.ai_provider.upper()} APIクォータ制限に達しました")
+                    logger.warning(f"💡 別のAIプロバイダーを試すか、時間をおいて再実行してください")
+                else:
+                    logger.error(f"❌ エラー: {result.stderr}")
+                return None
+                
+        except AnalysisCancelled:
+            return None
+        except subprocess.TimeoutExpired:
+            progress.finish(f"{stage_name} タイムアウト")
+            logger.warning(f"⏰ {self.ai_provider.upper()} {stage_name} がタイムアウトしました")
+            return None
+        except Exception as e:
+            progress.finish(f"{stage_name} エラー")
+            logger.error(f"❌ {self.ai_provider.upper()} {stage_name} でエラーが発生しました: {e}")
+            return None
+    
+    def _call_chatgpt_api(self, prompt):
+        """ChatGPT APIを呼び出す"""
+        try:
+            if not self.openai_api_key:
+                raise ValueError("OpenAI API key is required for ChatGPT")
+            
+            # プロンプト長をチェック（概算）
+            prompt_length = len(prompt.split())
+            if prompt_length > 8000:  # 安全マージンを考慮
+                logger.warning(f"⚠️ プロンプトが長すぎます ({prompt_length} words). 短縮します...")
+                # プロンプトを短縮
+                prompt = prompt[:16000] + "\n\n[プロンプトが長すぎるため短縮されました]"
+            
+            data = {
+                "model": "gpt-4o",
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "max_tokens": 4000,
+                "temperature": 0.7
+            }
+            
+            logger.info(f"🔄 ChatGPT API呼び出し中...")
+            
+            if HAS_REQUESTS:
+                # requests を使用（同一アナライザー内ではセッションの接続を再利用）
+                headers = {
+                    "Authorization": f"Bearer {self.openai_api_key}",
+                    "Content-Type": "application/json"
+                }
+                
+                response = self._get_http_session().post(
+                    "https://api.openai.com/v1/chat/completions",
+                    headers=headers,
+                    json=data,
+                    timeout=300
+                )
+                
+                status_code = response.status_code
+                
+                if status_code == 200:
+                    # 生のバイト列を直接解析（テキストへのデコードを省略）
+                    response_text = ""
+                    result_data = _json_loads(response.content)
+                else:
+                    response_text = response.text
+                    result_data = None
+                    
+            else:
+                # 標準ライブラリ http.client を使用（スレッドごとの接続を全段階で再利用）
+                json_data = json.dumps(data).encode('utf-8')
+                
+                try:
+                    status_code, response_body = self._openai_post_stdlib(
+                        "/v1/chat/completions",
+                        json_data,
+                        {
+                            "Authorization": f"Bearer {self.openai_api_key}",
+                            "Content-Type": "application/json"
+                        },
+                    )
+                except OSError as e:
+                    raise Exception(f"Network error: {e}")
+                response_text = "" if status_code == 200 else response_body.decode('utf-8', errors='replace')
+                result_data = _json_loads(response_body) if status_code == 200 else None
+            
+            # 共通のレスポンス処理
+            if status_code == 200:
+                try:
+                    if result_data and 'choices' in result_data and len(result_data['choices']) > 0:
+                        content = result_data['choices'][0]['message']['content']
+                        logger.info(f"✅ ChatGPT API呼び出し成功")
+                        return _AIResult(content)
+                    else:
+                        error_msg = "ChatGPT API response has no choices"
+                        logger.error(f"❌ {error_msg}")
+                        return _AIResult("", error_msg, 1)
+                        
+                except (KeyError, IndexError) as e:
+                    error_msg = f"ChatGPT API response format error: {e}"
+                    logger.error(f"❌ {error_msg}")
+                    return _AIResult("", error_msg, 1)
+                    
+            elif status_code == 401:
+                error_msg = "ChatGPT API authentication failed. Please check your API key."
+                logger.error(f"❌ {error_msg}")
+                return _AIResult("", error_msg, 1)
+                
+            elif status_code == 429:
+                error_msg = "ChatGPT API rate limit exceeded. Please wait and try again."
+                logger.error(f"❌ {error_msg}")
+                return _AIResult("", error_msg, 1)
+                
+            elif status_code == 400:
+                try:
+                    error_data = _json_loads(response_text)
+                    error_detail = error_data.get('error', {}).get('message', 'Unknown error')
+                    error_msg = f"ChatGPT API bad request: {error_detail}"
+                except (json.JSONDecodeError, AttributeError):
+                    error_msg = f"ChatGPT API bad request: {response_text}"
+                logger.error(f"❌ {error_msg}")
+                return _AIResult("", error_msg, 1)
+                
+            else:
+                error_msg = f"ChatGPT API error: {status_code} - {response_text}"
+                logger.error(f"❌ {error_msg}")
+                return _AIResult("", error_msg, 1)
+                
+        except Exception as e:
+            error_msg = f"ChatGPT API unexpected error: {str(e)}"
+            logger.error(f"❌ {error_msg}")
+            
+            return _AIResult("", error_msg, 1)
+    
+    def stage_1_basic_analysis(self):
+        """Stage 1: 基本情報収集"""
+        
+        if self.ai_provider == "chatgpt":
+            # ChatGPT用の修正されたプロンプト（リポジトリアクセス不要）
+            prompt = _STAGE1_CHATGPT_PROMPT_TMPL.format(github_url=self.github_url, repo_name=self.repo_name)
+        else:
+            # Claude/Gemini用の元のプロンプト
+            prompt = _STAGE1_PROMPT_TMPL.format(github_url=self.github_url)
+        
+        if self.pre_detected_indicators:
+            prompt += _STAGE1_INDICATORS_SECTION_TMPL.format(
+                indicators=json.dumps(self.pre_detected_indicators, ensure_ascii=False))
+        
+        result = self.execute_ai_analysis(prompt, "Stage 1: 基本情報収集", "stage1_basic")
+        if result:
+            try:
+                # JSONデータを抽出
+                json_data = self._parse_stage_output("stage1_basic", result)
+                self.save_stage_data("1_basic", json_data)
+                return json_data
+            except json.JSONDecodeError:
+                logger.warning("⚠️ Stage 1 JSON解析エラー、フォールバック用データを生成")
+                # フォールバック用の基本データを生成
+                fallback_data = copy.deepcopy(_STAGE1_FALLBACK)
+                fallback_data["repository_name"] = self.repo_name
+                self.save_stage_data("1_basic", fallback_data)
+                self.save_stage_data("1_basic_raw", {"raw_output": result})
+                logger.info("✅ フォールバックデータを使用してStage 2に継続")
+                return fallback_data
+        return None
+    
+    def stage_2_deep_code_analysis(self):
+        """Stage 2: 詳細コード分析"""
+        stage1_json = self.load_stage_data_serialized("1_basic")
+        
+        if not stage1_json:
+            logger.warning("⚠️ Stage 1データが利用できません。Stage 2をスキップします。")
+            return None
+        
+        prompt = _STAGE2_PROMPT_TMPL.format(github_url=self.github_url, stage1=stage1_json)
+        
+        result = self.execute_ai_analysis(prompt, "Stage 2: 詳細コード分析", "stage2_deep")
+        if result:
+            try:
+                json_data = self._parse_stage_output("stage2_deep", result)
+                self.save_stage_data("2_deep_analysis", json_data)
+                return json_data
+            except json.JSONDecodeError:
+                logger.warning("⚠️ Stage 2 JSON解析エラー、フォールバック用データを生成")
+                fallback_data = copy.deepcopy(_STAGE2_FALLBACK)
+                self.save_stage_data("2_deep_analysis", fallback_data)
+                self.save_stage_data("2_deep_analysis_raw", {"raw_output": result})
+                logger.info("✅ フォールバックデータを使用してStage 3に継続")
+                return fallback_data
+        return None
+    
+    def stage_3_consistency_check(self):
+        """Stage 3: 整合性チェックと補完"""
+        stage1_json = self.load_stage_data_serialized("1_basic")
+        stage2_json = self.load_stage_data_serialized("2_deep_analysis")
+        
+        if not stage1_json or not stage2_json:
+            logger.warning("⚠️ 前段階のデータが不足しています。Stage 3をスキップします。")
+            return None
+        
+        prompt = _STAGE3_PROMPT_TMPL.format(stage1=stage1_json, stage2=stage2_json)
+        
+        result = self.execute_ai_analysis(prompt, "Stage 3: 整合性チェック", "stage3_consistency")
+        if result:
+            try:
+                json_data = self._parse_stage_output("stage3_consistency", result)
+                self.save_stage_data("3_consistency", json_data)
+                return json_data
+            except json.JSONDecodeError:
+                logger.warning("⚠️ Stage 3 JSON解析エラー、フォールバック用データを生成")
+                fallback_data = copy.deepcopy(_STAGE3_FALLBACK)
+                self.save_stage_data("3_consistency", fallback_data)
+                self.save_stage_data("3_consistency_raw", {"raw_output": result})
+                logger.info("✅ フォールバックデータを使用してStage 4に継続")
+                return fallback_data
+        return None
+    
+    def stage_4_deep_insights(self, use_stage3=True):
+        """Stage 4: ディープ分析・洞察
+
+        Stage 3と並列に先行実行する場合は use_stage3=False で呼び出す
+        （実行タイミングによってプロンプトが変わらないよう、Stage 3の結果は参照しない）。
         """
+        stage1_json = self.load_stage_data_serialized("1_basic")
+        stage2_json = self.load_stage_data_serialized("2_deep_analysis")
+        stage3_json = self.load_stage_data_serialized("3_consistency") if use_stage3 else None
+        
+        if not all([stage1_json, stage2_json]):
+            logger.warning("⚠️ 前段階のデータが不足しています。Stage 4をスキップします。")
+            return None
+        
+        stage3_section = ""
+        if stage3_json:
+            stage3_section = _STAGE4_STAGE3_SECTION_TMPL.format(stage3=stage3_json)
+        
+        prompt = _STAGE4_PROMPT_TMPL.format(stage1=stage1_json, stage2=stage2_json, stage3_section=stage3_section)
+        
+        result = self.execute_ai_analysis(prompt, "Stage 4: ディープ分析", "stage4_insights")
+        if result:
+            try:
+                json_data = self._parse_stage_output("stage4_insights", result)
+                self.save_stage_data("4_deep_insights", json_data)
+                return json_data
+            except json.JSONDecodeError:
+                logger.warning("⚠️ Stage 4 JSON解析エラー、フォールバック用データを生成")
+                fallback_data = copy.deepcopy(_STAGE4_FALLBACK)
+                self.save_stage_data("4_deep_insights", fallback_data)
+                self.save_stage_data("4_deep_insights_raw", {"raw_output": result})
+                logger.info("✅ フォールバックデータを使用してStage 5に継続")
+                return fallback_data
+        return None
+    
+    def stage_5_final_synthesis(self):
+        """Stage 5: 最終統合・MDドキュメント生成"""
+        # 全段階のデータを読み込み
+        stage1_data = self.load_stage_data("1_basic")
+        stage2_data = self.load_stage_data("2_deep_analysis")
+        stage3_data = self.load_stage_data("3_consistency")
+        stage4_data = self.load_stage_data("4_deep_insights")
+        
+        # 既存の良いサンプルを参考例として読み込み
+        sample_usecase = self._load_sample_usecase()
         
-        result = self.execute_ai_analysis(prompt, "Stage 5: 最終統合")
+        prompt = _STAGE5_PROMPT_TMPL.format(
+            github_url=self.github_url,
+            repo_name=self.repo_name,
+            analysis_data=self._format_analysis_data_for_prompt(stage1_data, stage2_data, stage3_data, stage4_data),
+            sample_usecase=sample_usecase,
+            today=datetime.now().strftime('%Y-%m-%d'),
+        )
+        
+        result = self.execute_ai_analysis(prompt, "Stage 5: 最終統合", "stage5_synthesis")
         if result:
             self.save_stage_data("5_final_output", {"markdown": result})
             return result
         return None
     
+    def _cancelled(self):
+        """他のプロバイダーが先に成功し、分析を中断すべきか"""
+        return self.cancel_event is not None and self.cancel_event.is_set()
+    
     def execute_full_analysis(self):
         """全段階の分析を実行"""
-        print(f"\n🚀 {self.ai_provider.upper()}多段階分析を開始します")
-        print("=" * 60)
+        logger.info(f"\n🚀 {self.ai_provider.upper()}多段階分析を開始します")
+        logger.info("=" * 60)
         
         # Stage 1: 基本情報収集
-        print("\n[Stage 1/5] 基本情報収集")
-        print("-" * 40)
+        logger.info("\n[Stage 1/5] 基本情報収集")
+        logger.info("-" * 40)
         stage1_result = self.stage_1_basic_analysis()
+        if self._cancelled():
+            return None
         
         # Stage 2: 詳細コード分析
-        print("\n[Stage 2/5] 詳細コード分析")
-        print("-" * 40)
+        logger.info("\n[Stage 2/5] 詳細コード分析")
+        logger.info("-" * 40)
         stage2_result = self.stage_2_deep_code_analysis()
+        if self._cancelled():
+            return None
         
-        # Stage 3: 整合性チェック
-        print("\n[Stage 3/5] 整合性チェック・補完")
-        print("-" * 40)
-        stage3_result = self.stage_3_consistency_check()
+        # Stage 3 / Stage 4: どちらもStage 1・2の結果のみに依存するため並列実行
+        logger.info("\n[Stage 3-4/5] 整合性チェック・補完 / ディープ分析・洞察（並列実行）")
+        logger.info("-" * 40)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            stage3_future = executor.submit(self.stage_3_consistency_check)
+            stage4_future = executor.submit(self.stage_4_deep_insights, use_stage3=False)
+            stage3_result = stage3_future.result()
+            stage4_result = stage4_future.result()
+        if self._cancelled():
+            return None
         
-        # Stage 4: ディープ分析
-        print("\n[Stage 4/5] ディープ分析・洞察")
-        print("-" * 40)
-        stage4_result = self.stage_4_deep_insights()
+        # Stage 4はStage 3を待たずに先行実行しているため、矛盾が見つかった場合のみ補完結果を反映して再実行
+        if _has_contradictions(stage3_result):
+            logger.info("\n🔁 Stage 3で矛盾点が見つかったため、整合性チェックの結果を反映してStage 4を再実行します")
+            stage4_result = self.stage_4_deep_insights()
+            if self._cancelled():
+                return None
         
         # Stage 5: 最終統合
-        print("\n[Stage 5/5] 最終統合・ドキュメント生成")
-        print("-" * 40)
+        logger.info("\n[Stage 5/5] 最終統合・ドキュメント生成")
+        logger.info("-" * 40)
         final_result = self.stage_5_final_synthesis()
         
-        print("\n" + "=" * 60)
-        print(f"🎉 {self.ai_provider.upper()}多段階分析完了！")
+        logger.info("\n" + "=" * 60)
+        logger.info(f"🎉 {self.ai_provider.upper()}多段階分析完了！")
         
         return final_result
     
     def _load_sample_usecase(self):
         """良いサンプルのユースケースを読み込み"""
-        try:
-            sample_path = os.path.join(self.project_root, "use-cases", "AIエージェントによるプロジェクト初期構築支援.md")
-            if os.path.exists(sample_path):
-                with open(sample_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-        except:
-            pass
-        return ""
-    
-    def _load_template(self):
-        """テンプレートファイルを読み込み"""
-        try:
-            template_path = os.path.join(os.path.dirname(self.temp_dir), "../scripts/usecase_template.md")
-            if os.path.exists(template_path):
-                with open(template_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-        except:
-            pass
-        return ""
+        return _read_text_file(os.path.join(self.project_root, _SAMPLE_USECASE_RELPATH))
     
     def _format_analysis_data_for_prompt(self, stage1_data, stage2_data, stage3_data, stage4_data):
         """分析データをプロンプト用に整形"""
@@ -1098,103 +1634,360 @@ AI自動生成ドキュメント
     
     def _load_reference_usecase(self):
         """高速分析用の参考ユースケースを読み込み"""
-        try:
-            sample_path = os.path.join(self.project_root, "use-cases", "AIエージェントによるプロジェクト初期構築支援.md")
-            if os.path.exists(sample_path):
-                with open(sample_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-        except:
-            pass
-        return ""
+        return _read_text_file(os.path.join(self.project_root, _SAMPLE_USECASE_RELPATH))
+
+def _github_default_headers():
+    """GitHub API呼び出し共通のヘッダー（GITHUB_TOKENがあれば認証付き）"""
+    headers = {"User-Agent": "ai-usecase-gen/1.0", "Accept": "application/vnd.github+json"}
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"token {token}"
+    return headers
+
+@functools.lru_cache(maxsize=1)
+def _gh_auth_status():
+    """GitHub CLIの認証状態を確認（gh の起動は1プロセスにつき1回）"""
+    gh = _which("gh")
+    if gh is None:
+        # 未インストールなら起動を試みずに未認証扱い
+        return False
+    try:
+        result = subprocess.run([gh, "auth", "status"], 
+                              capture_output=True, text=True)
+        return result.returncode == 0
+    except FileNotFoundError:
+        return False
+
+@functools.lru_cache(maxsize=1)
+def _github_token():
+    """GitHub APIのトークンを取得（GITHUB_TOKEN、なければ `gh auth token`）"""
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        return token
+    gh = _which("gh")
+    if gh is None:
+        return None
+    try:
+        result = subprocess.run([gh, "auth", "token"], 
+                              capture_output=True, text=True)
+    except FileNotFoundError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+# 標準ライブラリ経由のGitHub API呼び出しで追従するリダイレクト
+_REDIRECT_STATUSES = frozenset((301, 302, 303, 307, 308))
+_MAX_GITHUB_REDIRECTS = 5
+
+# GraphQLの一括確認で1クエリにまとめるリポジトリ数
+_GRAPHQL_BATCH_SIZE = 50
+
+# リポジトリ構成の手掛かりになるファイル（Tree APIの結果から抽出）
+_REPO_INDICATOR_RE = re.compile(
+    r"(requirements\.txt|pyproject\.toml|package\.json|\.ipynb$|model.*\.(pkl|pt|onnx|h5)$|\.github/)"
+)
+_MAX_REPO_INDICATORS = 100
+
+# アクセス不可だったリポジトリを再確認するまでの最小間隔（秒）
+_RECHECK_INTERVAL = 2.0
+
+# 生成結果のプレビューとして表示する先頭の文字数
+_PREVIEW_CHARS = 500
+
+def _log_preview(text):
+    """生成結果の先頭部分と総文字数を表示（--quiet 時は文字列を切り出さない）"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    length = len(text)
+    logger.info("%s%s", text[:_PREVIEW_CHARS], "..." if length > _PREVIEW_CHARS else "")
+    logger.info("-" * 50)
+    logger.info(f"📊 総文字数: {length:,} 文字")
+
+# 生成したユースケースのコミットメッセージ
+_COMMIT_TEMPLATE = "feat: Add use case for {repo}\n\n🤖 Generated with [Claude Code](https://claude.ai/code)\n\nCo-Authored-By: Claude <noreply@anthropic.com>"
 
 class UseCaseGenerator:
     def __init__(self, project_root):
+        # カレントディレクトリに依存しないよう絶対パスで保持
+        project_root = os.path.abspath(project_root)
         self.project_root = project_root
         self.use_cases_dir = os.path.join(project_root, "use-cases")
         self.scripts_dir = os.path.join(project_root, "scripts")
         self.cli_outputs_dir = os.path.join(project_root, ".cli_outputs")
         self.config_dir = os.path.join(project_root, ".config")
+        self.cache_dir = os.path.join(project_root, ".cache")
+        self.repo_meta_cache_file = os.path.join(self.cache_dir, "github_repo_meta.json")
+        self.usecase_cache_dir = os.path.join(self.cache_dir, "usecase")
         self.api_manager = APIKeyManager(self.config_dir)
         os.makedirs(self.cli_outputs_dir, exist_ok=True)
+        # GitHub API呼び出し用の接続（keep-aliveで再利用・スレッドごとに保持）
+        self._github_local = threading.local()
+        self._repo_meta_lock = threading.Lock()
+        # アクセス不可だった確認結果（短時間の再確認ではネットワークに問い合わせない）
+        self._negative_checks = {}
+        # 検証に成功したリポジトリ（owner/repo を小文字化したキー → "owner/repo"）
+        # 再検証時にネットワーク確認を省略する
+        self._validated_repos = {}
+        # pygit2のリポジトリハンドル（初回のGit操作時に生成）
+        self._git_repo = None
+        # 一括処理の並行実行時もGit操作は1件ずつ行う
+        self._git_lock = threading.Lock()
+        # インストール済みのAI CLI（未インストールのプロバイダーは起動せずにスキップ）
+        self._available = {provider: _which(provider) for provider in ("gemini", "claude")}
+        self._http = None
+        if HAS_REQUESTS:
+            self._http = requests.Session()
+            self._http.headers.update(_github_default_headers())
+            # 接続先は api.github.com のみ。並行検証・一括処理のワーカー数分の接続を保持
+            self._http.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=10))
         
     def print_header(self):
         """ヘッダー表示"""
-        print("=" * 60)
-        print("🚀 AI Use Case自動生成ツール")
-        print("=" * 60)
+        logger.info("=" * 60)
+        logger.info("🚀 AI Use Case自動生成ツール")
+        logger.info("=" * 60)
         
     def print_step(self, step, total, message):
         """ステップ表示"""
-        print(f"\n[{step}/{total}] {message}")
-        print("-" * 40)
+        logger.info(f"\n[{step}/{total}] {message}")
+        logger.info("-" * 40)
+        
+    def check_github_auth(self):
+        """GitHub認証状態をチェック（結果はプロセス内でキャッシュ）"""
+        return _gh_auth_status()
+    
+    def _load_repo_meta_cache(self):
+        """GitHub APIレスポンスのキャッシュ（ETag付き）を読み込み"""
+        try:
+            with open(self.repo_meta_cache_file, 'rb') as f:
+                return _json_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_repo_meta_cache(self, cache):
+        """GitHub APIレスポンスのキャッシュを保存（一時ファイル経由で置き換え）"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _replace_file_bytes(self.repo_meta_cache_file, _json_dumps_bytes(cache))
+        except OSError:
+            pass
+    
+    def _github_request_stdlib(self, path, headers, method="GET", body=None):
+        """標準ライブラリでGitHub APIにリクエスト（接続を再利用）
+
+        戻り値は (status, etag, body)。切断済みのkeep-alive接続は1回だけ張り直す。
+        GETのリダイレクト（名前変更・移管されたリポジトリ）は api.github.com 内に限り追従する。
+        """
+        request_headers = _github_default_headers()
+        request_headers.update(headers)
+        for _ in range(_MAX_GITHUB_REDIRECTS + 1):
+            status, response_headers, response_body = self._github_send_stdlib(method, path, request_headers, body)
+            location = response_headers.get("Location")
+            if method != "GET" or status not in _REDIRECT_STATUSES or not location:
+                break
+            target = _cached_urlsplit(urljoin(f"https://api.github.com{path}", location))
+            if target.scheme != "https" or target.netloc != "api.github.com":
+                break
+            path = target.path + (f"?{target.query}" if target.query else "")
+        return status, response_headers.get("ETag"), response_body
+    
+    def _github_send_stdlib(self, method, path, headers, body):
+        """keep-alive接続で1回リクエストを送信し (status, ヘッダー, body) を返す"""
+        import http.client
+        
+        for attempt in range(2):
+            conn = getattr(self._github_local, "conn", None)
+            if conn is None:
+                conn = self._github_local.conn = http.client.HTTPSConnection("api.github.com", timeout=10)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response_body = response.read()
+                return response.status, response.headers, response_body
+            except (http.client.HTTPException, ConnectionError):
+                conn.close()
+                self._github_local.conn = None
+                if attempt:
+                    raise
+    
+    def _github_get(self, path, headers):
+        """GitHub APIにGETリクエスト（requests・標準ライブラリのどちらでも同じ形で返す）
+
+        戻り値は (status, etag, body)。接続できなかった場合は None。
+        """
+        if HAS_REQUESTS:
+            try:
+                response = self._http.get("https://api.github.com" + path, headers=headers, timeout=10)
+            except requests.RequestException:
+                return None
+            return response.status_code, response.headers.get("ETag"), response.content
         
-    def check_github_auth(self):
-        """GitHub認証状態をチェック"""
+        import http.client
         try:
-            # GitHub CLIの認証状態確認
-            result = subprocess.run(["gh", "auth", "status"], 
-                                  capture_output=True, text=True)
-            return result.returncode == 0
-        except FileNotFoundError:
-            return False
+            return self._github_request_stdlib(path, headers)
+        except (http.client.HTTPException, OSError):
+            return None
     
-    def check_repo_accessibility(self, owner, repo):
-        """リポジトリのアクセス可能性をチェック"""
+    def check_repos_accessibility_batch(self, pairs):
+        """複数リポジトリのアクセス可能性をGraphQL APIでまとめて確認
+
+        リポジトリごとにエイリアスを付けた1つのクエリで問い合わせる（レート制限の消費も1回分）。
+        戻り値は {(owner, repo): (accessible, repo_type, repo_data)}。
+        GraphQL APIはトークン必須のため、トークンがない・失敗した場合は None（呼び出し側でREST確認）。
+        """
+        token = _github_token()
+        if not token:
+            return None
         
-        if HAS_REQUESTS:
+        results = {}
+        for start in range(0, len(pairs), _GRAPHQL_BATCH_SIZE):
+            chunk = pairs[start:start + _GRAPHQL_BATCH_SIZE]
+            params, fields, variables = [], [], {}
+            for i, (owner, repo) in enumerate(chunk):
+                params.append(f"$o{i}: String!, $n{i}: String!")
+                fields.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ isPrivate url }}")
+                variables[f"o{i}"] = owner
+                variables[f"n{i}"] = repo
+            query = f"query({', '.join(params)}) {{ {' '.join(fields)} }}"
+            body = _json_dumps_bytes({"query": query, "variables": variables})
+            headers = {"Authorization": f"bearer {token}", "Content-Type": "application/json"}
+            
+            if HAS_REQUESTS:
+                try:
+                    response = self._http.post("https://api.github.com/graphql", data=body,
+                                               headers=headers, timeout=10)
+                except requests.RequestException:
+                    return None
+                status, content = response.status_code, response.content
+            else:
+                import http.client
+                try:
+                    status, _, content = self._github_request_stdlib("/graphql", headers, "POST", body)
+                except (http.client.HTTPException, OSError):
+                    return None
+            if status != 200:
+                return None
+            
             try:
-                # GitHub API経由でリポジトリ情報を取得
-                url = f"https://api.github.com/repos/{owner}/{repo}"
-                response = requests.get(url, timeout=10)
-                
-                if response.status_code == 200:
-                    repo_data = response.json()
-                    if repo_data.get("private", False):
-                        return True, "private", repo_data
-                    else:
-                        return True, "public", repo_data
-                elif response.status_code == 404:
-                    # プライベートリポジトリまたは存在しないリポジトリ
-                    return False, "private_or_not_found", None
+                data = _json_loads(content).get("data")
+            except (json.JSONDecodeError, AttributeError):
+                return None
+            if not isinstance(data, dict):
+                return None
+            
+            for i, target in enumerate(chunk):
+                node = data.get(f"r{i}")
+                if node is None:
+                    # 存在しない、またはトークンの権限では見えないリポジトリ
+                    results[target] = (False, "private_or_not_found", None)
                 else:
-                    return False, "no_access", None
-                    
-            except requests.RequestException:
-                return False, "network_error", None
+                    repo_data = {"private": node.get("isPrivate", False), "html_url": node.get("url")}
+                    results[target] = self._classify_repo_data(repo_data)
+        return results
+    
+    def _classify_repo_data(self, repo_data):
+        """リポジトリ情報から公開状態を判定"""
+        if repo_data.get("private", False):
+            return True, "private", repo_data
         else:
-            # urllib.requestを使用したフォールバック
+            return True, "public", repo_data
+    
+    def check_repo_accessibility(self, owner, repo):
+        """リポジトリのアクセス可能性をチェック（ETagによる条件付きリクエスト対応）"""
+        
+        cache_key = f"{owner}/{repo}"
+        meta_cache = self._load_repo_meta_cache()
+        cached = meta_cache.get(cache_key)
+        
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        
+        def update_cache(etag, repo_data):
+            if etag:
+                # 並行検証時に他スレッドの書き込みを失わないよう、ロック内で読み直して更新
+                with self._repo_meta_lock:
+                    latest = self._load_repo_meta_cache()
+                    latest[cache_key] = {"etag": etag, "data": repo_data, "ts": time.time()}
+                    self._save_repo_meta_cache(latest)
+        
+        # GitHub API経由でリポジトリ情報を取得
+        response = self._github_get(f"/repos/{owner}/{repo}", headers)
+        if response is None:
+            return False, "network_error", None
+        status, etag, body = response
+        
+        if status == 304 and cached:
+            # 変更なし：キャッシュ済みの情報を使用
+            return self._classify_repo_data(cached["data"])
+        elif status == 200:
             try:
-                import urllib.request
-                import urllib.error
-                
-                url = f"https://api.github.com/repos/{owner}/{repo}"
-                req = urllib.request.Request(url)
-                
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    if response.status == 200:
-                        import json
-                        repo_data = json.loads(response.read().decode())
-                        if repo_data.get("private", False):
-                            return True, "private", repo_data
-                        else:
-                            return True, "public", repo_data
-                            
-            except urllib.error.HTTPError as e:
-                if e.code == 404:
-                    return False, "private_or_not_found", None
-                else:
-                    return False, "no_access", None
-            except Exception:
-                return False, "network_error", None
+                repo_data = _json_loads(body)
+            except json.JSONDecodeError:
+                return False, "unknown_error", None
+            update_cache(etag, repo_data)
+            return self._classify_repo_data(repo_data)
+        elif status == 404:
+            # プライベートリポジトリまたは存在しないリポジトリ
+            return False, "private_or_not_found", None
+        else:
+            return False, "no_access", None
+    
+    def _fetch_repo_tree(self, owner, repo):
+        """GitHub Tree APIでファイル一覧を取得し、構成の手掛かりになるパスを抽出
+
+        ツリーのSHAと抽出結果はETag付きでキャッシュし、変更がなければ再抽出しない。
+        取得できない場合は None を返す（分析自体は継続）。
+        """
+        path = f"/repos/{owner}/{repo}/git/trees/HEAD?recursive=1"
+        cache_key = f"tree:{owner}/{repo}"
+        cached = self._load_repo_meta_cache().get(cache_key)
+        
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        
+        response = self._github_get(path, headers)
+        if response is None:
+            return None
+        status, etag, body = response
+        
+        if status == 304 and cached:
+            return cached["indicators"]
+        if status != 200:
+            return None
+        
+        try:
+            tree_data = _json_loads(body)
+        except json.JSONDecodeError:
+            return None
         
-        return False, "unknown_error", None
+        search = _REPO_INDICATOR_RE.search
+        indicators = [
+            entry["path"] for entry in tree_data.get("tree", [])
+            if entry.get("type") == "blob" and search(entry.get("path", ""))
+        ][:_MAX_REPO_INDICATORS]
+        
+        if etag:
+            with self._repo_meta_lock:
+                latest = self._load_repo_meta_cache()
+                latest[cache_key] = {"etag": etag, "sha": tree_data.get("sha"),
+                                     "indicators": indicators, "ts": time.time()}
+                self._save_repo_meta_cache(latest)
+        return indicators
     
     def handle_private_repo_access(self, owner, repo):
         """プライベートリポジトリのアクセス処理"""
-        print(f"\n🔒 プライベートリポジトリ '{owner}/{repo}' が検出されました")
+        logger.info(f"\n🔒 プライベートリポジトリ '{owner}/{repo}' が検出されました")
         
         # GitHub CLI認証状態確認
         if not self.check_github_auth():
+            # 非対話環境（CI・スクリプト・一括処理）では入力待ちせずに即座に失敗
+            if not sys.stdin.isatty():
+                logger.error("❌ GitHub CLI認証が必要です（非対話環境のため、事前に `gh auth login` を実行してください）")
+                return False
+            
             print("\n⚠️ GitHub CLI認証が必要です")
             print("以下のコマンドで認証してください:")
             print("  gh auth login")
@@ -1203,6 +1996,9 @@ class UseCaseGenerator:
             if choice in ['', 'y', 'yes']:
                 try:
                     subprocess.run(["gh", "auth", "login"], check=True)
+                    # 認証状態・トークンが変わったため、次回の確認時に gh を再実行する
+                    _gh_auth_status.cache_clear()
+                    _github_token.cache_clear()
                     print("✅ 認証が完了しました")
                     return True
                 except (subprocess.CalledProcessError, FileNotFoundError):
@@ -1214,56 +2010,48 @@ class UseCaseGenerator:
                 print("2. アクセス権限のあるアカウントで認証する")
                 return False
         else:
-            print("✅ GitHub CLI認証済み - プライベートリポジトリにアクセス可能です")
+            logger.info("✅ GitHub CLI認証済み - プライベートリポジトリにアクセス可能です")
             return True
     
     def extract_repo_name(self, github_url):
         """GitHubURLからリポジトリ名を抽出"""
-        parsed = urlparse(github_url)
-        path_parts = parsed.path.strip('/').split('/')
-        if len(path_parts) >= 2:
-            return f"{path_parts[0]}_{path_parts[1]}"
-        return "unknown_repo"
+        return extract_repo_name(github_url)
     
-    def validate_github_url(self, github_url):
-        """GitHubURLの検証とアクセス可能性チェック"""
+    def _parse_github_url(self, github_url):
+        """GitHubURLを (owner, repo) に分解。失敗時は (None, エラーメッセージ)"""
         
         # URL形式の基本チェック
         if not github_url.startswith(('https://github.com/', 'http://github.com/', 'github.com/')):
-            return False, "有効なGitHubURLを入力してください（例: https://github.com/user/repo）"
+            return None, "有効なGitHubURLを入力してください（例: https://github.com/user/repo）"
         
         # URLの正規化
-        if not github_url.startswith('http'):
+        if not github_url.startswith(('https://', 'http://')):
             github_url = 'https://' + github_url
         
         try:
-            parsed = urlparse(github_url)
+            parsed = _cached_urlsplit(github_url)
             path_parts = parsed.path.strip('/').split('/')
             
             if len(path_parts) < 2:
-                return False, "URLにユーザー名とリポジトリ名が含まれていません"
+                return None, "URLにユーザー名とリポジトリ名が含まれていません"
             
             owner, repo = path_parts[0], path_parts[1]
             
             # .git拡張子を削除
             if repo.endswith('.git'):
                 repo = repo[:-4]
-        except Exception:
-            return False, "URLの解析に失敗しました"
-        
-        if repo.endswith('.git'):
-            repo = repo[:-4]
-        
-        print(f"🔍 リポジトリアクセス確認中: {owner}/{repo}")
-        
-        # リポジトリのアクセス可能性をチェック
-        accessible, repo_type, repo_data = self.check_repo_accessibility(owner, repo)
+        except ValueError:
+            return None, "URLの解析に失敗しました"
         
+        return owner, repo
+    
+    def _resolve_access(self, owner, repo, accessible, repo_type):
+        """アクセス確認結果を (is_valid, result) に変換（プライベートは対話処理）"""
         if accessible:
             if repo_type == "public":
-                print(f"✅ Publicリポジトリ: アクセス可能")
+                logger.info("✅ Publicリポジトリ: アクセス可能")
             elif repo_type == "private":
-                print(f"✅ Privateリポジトリ: 認証済みでアクセス可能")
+                logger.info("✅ Privateリポジトリ: 認証済みでアクセス可能")
             return True, f"{owner}/{repo}"
         else:
             if repo_type == "private_or_not_found":
@@ -1279,6 +2067,83 @@ class UseCaseGenerator:
             else:
                 return False, f"リポジトリ '{owner}/{repo}' が見つからないか、アクセスできません"
     
+    def validate_github_url(self, github_url):
+        """GitHubURLの検証とアクセス可能性チェック"""
+        
+        owner, repo = self._parse_github_url(github_url)
+        if owner is None:
+            return False, repo
+        
+        # 検証済みのリポジトリはアクセス確認を省略
+        cache_key = f"{owner}/{repo}".lower()
+        if cache_key in self._validated_repos:
+            logger.info(f"✅ 検証済みリポジトリ: {self._validated_repos[cache_key]}")
+            return True, self._validated_repos[cache_key]
+        
+        # 直前にアクセス不可だったリポジトリは一定間隔をあけるまで再確認しない
+        previous = self._negative_checks.get((owner, repo))
+        if previous and time.monotonic() - previous[0] < _RECHECK_INTERVAL:
+            logger.info(f"⏳ {_RECHECK_INTERVAL:.0f}秒以上間隔をあけて再確認してください")
+            accessible, repo_type = False, previous[1]
+        else:
+            logger.info(f"🔍 リポジトリアクセス確認中: {owner}/{repo}")
+            
+            # リポジトリのアクセス可能性をチェック
+            accessible, repo_type, repo_data = self.check_repo_accessibility(owner, repo)
+            if accessible:
+                self._negative_checks.pop((owner, repo), None)
+            else:
+                self._negative_checks[(owner, repo)] = (time.monotonic(), repo_type)
+        is_valid, result = self._resolve_access(owner, repo, accessible, repo_type)
+        if is_valid:
+            self._validated_repos[cache_key] = result
+        return is_valid, result
+    
+    def validate_github_urls(self, github_urls, max_workers=8):
+        """複数のGitHubURLを並行検証
+
+        ネットワークI/O（アクセス確認）のみ並行実行し、プライベートリポジトリの
+        対話処理は入力が混ざらないよう順番に行う。戻り値は入力順の (is_valid, result) のリスト。
+        """
+        parsed = [self._parse_github_url(url) for url in github_urls]
+        targets = [(owner, repo) for owner, repo in parsed
+                   if owner is not None and f"{owner}/{repo}".lower() not in self._validated_repos]
+        
+        unique_targets = list(dict.fromkeys(targets))
+        
+        # 2件以上はGraphQLで1回のリクエストにまとめ、使えない場合はRESTで並行チェック
+        checks = None
+        if len(unique_targets) > 1:
+            checks = self.check_repos_accessibility_batch(unique_targets)
+            if checks is not None:
+                logger.info(f"🔍 リポジトリアクセス確認: {len(unique_targets)}件を一括チェックしました")
+        if checks is None:
+            if unique_targets:
+                logger.info(f"🔍 リポジトリアクセス確認中: {len(unique_targets)}件を並行チェック")
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_targets) or 1))) as executor:
+                futures = {
+                    target: executor.submit(self.check_repo_accessibility, *target)
+                    for target in unique_targets
+                }
+            checks = {target: future.result() for target, future in futures.items()}
+        
+        results = []
+        for owner, repo in parsed:
+            if owner is None:
+                results.append((False, repo))
+                continue
+            cache_key = f"{owner}/{repo}".lower()
+            if cache_key in self._validated_repos:
+                results.append((True, self._validated_repos[cache_key]))
+                continue
+            accessible, repo_type, _ = checks[(owner, repo)]
+            logger.info(f"📦 {owner}/{repo}")
+            is_valid, result = self._resolve_access(owner, repo, accessible, repo_type)
+            if is_valid:
+                self._validated_repos[cache_key] = result
+            results.append((is_valid, result))
+        return results
+    
     def load_prompt_template(self):
         """プロンプトテンプレートを読み込み"""
         template_path = os.path.join(self.scripts_dir, "prompt_template.md")
@@ -1343,14 +2208,7 @@ class UseCaseGenerator:
     
     def _load_sample_usecase_for_generator(self):
         """UseCaseGenerator用の参考ユースケースを読み込み"""
-        try:
-            sample_path = os.path.join(self.project_root, "use-cases", "AIエージェントによるプロジェクト初期構築支援.md")
-            if os.path.exists(sample_path):
-                with open(sample_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-        except:
-            pass
-        return ""
+        return _read_text_file(os.path.join(self.project_root, _SAMPLE_USECASE_RELPATH))
     
     def call_ai_cli(self, github_url, repo_name, ai_config):
         """AI CLIを呼び出してユースケース分析を実行"""
@@ -1360,295 +2218,517 @@ class UseCaseGenerator:
         openai_api_key = ai_config.get('openai_api_key')
         
         providers = ["claude", "gemini"] if ai_provider == "auto" else [ai_provider]
+        missing = [p for p in providers if p in self._available and not self._available[p]]
+        providers = [p for p in providers if p not in missing]
+        for provider in missing:
+            logger.warning(f"⚠️ {provider.upper()} CLIが見つからないためスキップします")
+        if not providers:
+            logger.error("❌ 利用可能なAI CLIが見つかりません")
+            return None
         
-        for provider in providers:
-            try:
-                print(f"\n🤖 {provider.upper()} AI でリポジトリ分析開始")
-                print(f"📂 対象リポジトリ: {repo_name}")
+        # リポジトリのHEADが前回から変わっていなければ生成済みの結果を再利用
+        cache_mode = ai_config.get('cache_mode', 'use')
+        head_sha = None
+        cache_path = None
+        if cache_mode != "off":
+            head_sha = self._remote_head_sha(github_url)
+            if head_sha:
+                cache_path = self._usecase_cache_path(github_url, ai_provider, precision, head_sha)
+                if cache_mode == "use":
+                    cached = self._read_usecase_cache(cache_path)
+                    if cached:
+                        logger.info(f"\n♻️ リポジトリに変更がないため、生成済みのユースケースを再利用します（HEAD: {head_sha[:7]}）")
+                        return cached
+        
+        # 高精度モードではリポジトリ構成をAI呼び出し前に取得（全プロバイダーで共有）
+        pre_detected_indicators = None
+        if precision == "high":
+            owner, repo = self._parse_github_url(github_url)
+            if owner is not None:
+                pre_detected_indicators = self._fetch_repo_tree(owner, repo)
+                if pre_detected_indicators:
+                    logger.info(f"🗂️  事前検出ファイル: {len(pre_detected_indicators)}件（GitHub Tree API）")
+        
+        options = {"cache_salt": head_sha, "cache_mode": cache_mode}
+        if precision == "fast":
+            # 高速モードのプロンプトはプロバイダーに依存しないため1回だけ生成
+            options["fast_prompt"] = self._build_fast_prompt(github_url, repo_name)
+        
+        # 自動選択モードでは複数プロバイダーを並行実行し、最初に成功した結果を採用
+        output = None
+        if len(providers) > 1:
+            cancel_event = threading.Event()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(providers)) as executor:
+                futures = [
+                    executor.submit(self._run_one_provider, provider, github_url, repo_name, precision,
+                                    openai_api_key, pre_detected_indicators, cancel_event, **options)
+                    for provider in providers
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    output = future.result()
+                    if output:
+                        # 残りのプロバイダーのCLIプロセスを終了させる
+                        cancel_event.set()
+                        break
+        else:
+            output = self._run_one_provider(providers[0], github_url, repo_name, precision,
+                                            openai_api_key, pre_detected_indicators, **options)
+        
+        if output and cache_path:
+            self._write_usecase_cache(cache_path, output)
+        return output or None
+    
+    def _remote_head_sha(self, github_url):
+        """git ls-remote でリモートのHEADのSHAを取得（取得できなければNone）"""
+        owner, repo = self._parse_github_url(github_url)
+        if owner is None:
+            return None
+        # 認証プロンプトで止まらないよう、端末からの入力を無効化
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        try:
+            result = subprocess.run(
+                ["git", "ls-remote", f"https://github.com/{owner}/{repo}.git", "HEAD"],
+                capture_output=True, text=True, timeout=15, env=env
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return None
+        if result.returncode != 0 or not result.stdout:
+            return None
+        return result.stdout.split()[0]
+    
+    def _usecase_cache_path(self, github_url, provider, precision, head_sha):
+        """リポジトリ・プロバイダー・精度・HEADのSHAから生成結果キャッシュのパスを決定"""
+        owner, repo = self._parse_github_url(github_url)
+        repo_key = f"{owner}/{repo}".lower()
+        key = hashlib.sha256(f"{repo_key}|{provider}|{precision}|{head_sha}".encode('utf-8')).hexdigest()
+        return os.path.join(self.usecase_cache_dir, f"{key}.md")
+    
+    def _read_usecase_cache(self, cache_path):
+        """生成結果キャッシュを読み込み（なければNone）"""
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _write_usecase_cache(self, cache_path, content):
+        """生成結果キャッシュを書き込み（一時ファイル経由で置き換え）"""
+        try:
+            os.makedirs(self.usecase_cache_dir, exist_ok=True)
+            _replace_file_bytes(cache_path, content.encode('utf-8'))
+        except OSError:
+            pass
+    
+    def _build_fast_prompt(self, github_url, repo_name):
+        """高速単発分析のプロンプトを生成（参考ユースケース・日付を埋め込む）"""
+        return _FAST_PROMPT_TMPL.format(
+            github_url=github_url,
+            repo_name=repo_name,
+            sample_usecase=self._load_sample_usecase_for_generator(),
+            today=datetime.now().strftime('%Y-%m-%d'),
+        )
+    
+    def _run_one_provider(self, provider, github_url, repo_name, precision, openai_api_key,
+                          pre_detected_indicators=None, cancel_event=None, cache_salt=None, cache_mode="use",
+                          fast_prompt=None):
+        """1つのAIプロバイダーで分析を実行。失敗・中断時は None
+
+        fast_prompt は高速モードで全プロバイダーが共有する生成済みのプロンプト（省略時はここで生成）。
+        """
+        try:
+            logger.info(f"\n🤖 {provider.upper()} AI でリポジトリ分析開始")
+            logger.info(f"📂 対象リポジトリ: {repo_name}")
+            
+            if precision == "high":
+                # 高精度多段階分析
+                logger.info(f"🔬 高精度多段階分析モード")
+                logger.info(f"⏱️  予想時間: 10-15分（5段階分析）")
                 
-                if precision == "high":
-                    # 高精度多段階分析
-                    print(f"🔬 高精度多段階分析モード")
-                    print(f"⏱️  予想時間: 10-15分（5段階分析）")
-                    
-                    # 一時ディレクトリを作成
-                    with tempfile.TemporaryDirectory(prefix=f"{provider}_analysis_") as temp_dir:
-                        analyzer = MultiStageAnalyzer(github_url, repo_name, temp_dir, self.cli_outputs_dir, provider, openai_api_key)
+                # 一時ディレクトリを作成（高精度モードでのみ使用するため遅延インポート）
+                import tempfile
+                with tempfile.TemporaryDirectory(prefix=f"{provider}_analysis_") as temp_dir:
+                    analyzer = MultiStageAnalyzer(github_url, repo_name, temp_dir, self.cli_outputs_dir, provider, openai_api_key,
+                                                  pre_detected_indicators, cancel_event,
+                                                  cache_salt=cache_salt, cache_mode=cache_mode)
+                    try:
                         result = analyzer.execute_full_analysis()
+                    finally:
+                        analyzer.close()
+                    
+                    if result:
+                        logger.info(f"\n📄 {provider.upper()}多段階分析結果:")
+                        logger.info("-" * 50)
+                        _log_preview(result)
+                        logger.info(f"💾 分析ログ保存: {os.path.relpath(self.cli_outputs_dir, self.project_root)}")
                         
-                        if result:
-                            print(f"\n📄 {provider.upper()}多段階分析結果:")
-                            print("-" * 50)
-                            # 最初の500文字を表示
-                            preview = result[:500] + "..." if len(result) > 500 else result
-                            print(preview)
-                            print("-" * 50)
-                            print(f"📊 総文字数: {len(result):,} 文字")
-                            print(f"💾 分析ログ保存: {os.path.relpath(self.cli_outputs_dir, self.project_root)}")
-                            
-                            return result
-                        else:
-                            print(f"❌ {provider.upper()}多段階分析に失敗しました")
-                            if ai_provider != "auto":
-                                return None
-                            continue
+                        return result
+                    elif cancel_event is not None and cancel_event.is_set():
+                        logger.info(f"⏹️ {provider.upper()}: 他のプロバイダーが先に完了したため中断しました")
+                        return None
+                    else:
+                        logger.error(f"❌ {provider.upper()}多段階分析に失敗しました")
+                        return None
+            
+            elif precision == "fast":
+                # 高速単発分析
+                logger.info(f"⚡ 高速単発分析モード")
+                logger.info(f"⏱️  予想時間: 1-3分")
                 
-                elif precision == "fast":
-                    # 高速単発分析
-                    print(f"⚡ 高速単発分析モード")
-                    print(f"⏱️  予想時間: 1-3分")
-                    
-                    # 良いサンプルを読み込み
-                    sample_usecase = self._load_sample_usecase_for_generator()
-                    
-                    # ChatGPT用の修正されたプロンプト（リポジトリアクセス不要）
-                    prompt = f"""
-あなたはAIユースケース分析の専門家です。
-
-## 対象リポジトリ情報
-- **URL**: {github_url}
-- **リポジトリ名**: {repo_name}
-
-注意：あなたは直接リポジトリにアクセスできません。以下のガイドラインに従って、リポジトリ名とURLから推測できる内容と、一般的なベストプラクティスに基づいてユースケースドキュメントを生成してください。
-
-## 参考フォーマット（良い例）
-{sample_usecase}
-
-## ドキュメント生成指示
-
-以下の形式で完全なMarkdownドキュメントを生成してください：
-
-```yaml
----
-title: "[{repo_name}に基づく具体的なプロジェクトタイトル]"
-summary: "[1-2文の簡潔で的確な概要]"
-category: "[適切なカテゴリ：AIユースケース/Web開発/データ分析/モバイルアプリ/ツール/ライブラリ/その他]"
-industry: "[対象業界：IT・ソフトウェア/製造業/金融/ヘルスケア/教育/エンタメ/その他]"
-createdAt: {datetime.now().strftime('%Y-%m-%d')}
-updatedAt: {datetime.now().strftime('%Y-%m-%d')}
-status: "[開発中/完了/実験的/アーカイブ/メンテナンス中]"
-github_link: {github_url}
-contributors:
-  - "[推測されるコントリビューター名またはプレースホルダー]"
-tags:
-  - "[主要技術タグ1]"
-  - "[主要技術タグ2]"
-  - "[主要技術タグ3]"
----
-
-<!-- 
-AI自動生成ドキュメント
-生成後にユーザーが内容を確認し、必要に応じて手動で編集・整理することを推奨します。
-特にプロジェクト固有の詳細情報や最新の開発状況については、適宜更新してください。
--->
-```
-
-## 必須セクション（この順序で）：
-1. # [プロジェクトタイトル]
-2. ## 概要
-3. ## 課題・ニーズ  
-4. ## AI技術（AI/ML使用時）または ## 技術スタック
-5. ## 実装フロー
-6. ## 主要機能
-7. ## 技術的詳細
-8. ## 期待される効果
-9. ## リスク・課題
-10. ## 応用・展開可能性
-11. ## コントリビューター
-12. ## 参考リンク
-
-## 重要な指示：
-- リポジトリに直接アクセスできないことを前提として作成
-- リポジトリ名から推測される内容で合理的なドキュメントを作成
-- プレースホルダーや一般的な説明は避け、具体的で有用な内容を記述
-- 「分析中」「確認が必要」などの不完全な表現は使用しない
-- 完全で読みやすいMarkdownドキュメントを生成
-
-完全で高品質なMarkdownドキュメントを生成してください。
-                    """
-                    
-                    # プログレスバー開始
-                    progress = ProgressBar()
-                    
-                    # 非同期でプログレス表示
-                    import threading
-                    stop_progress = threading.Event()
-                    
-                    def show_progress():
-                        while not stop_progress.is_set():
-                            progress.show(f"{provider.upper()}高速分析中")
-                    
-                    progress_thread = threading.Thread(target=show_progress)
-                    progress_thread.daemon = True
-                    progress_thread.start()
-                    
-                    # AI CLI実行
+                # ChatGPT用の修正されたプロンプト（リポジトリアクセス不要）
+                prompt = fast_prompt or self._build_fast_prompt(github_url, repo_name)
+                
+                # プログレスバー（CLI実行中は出力待ちのループから更新）
+                progress = ProgressBar()
+                progress_message = f"{provider.upper()}高速分析中"
+                
+                def on_tick():
+                    progress.tick(progress_message)
+                
+                def on_heartbeat(received_bytes, elapsed):
+                    progress.heartbeat(progress_message, received_bytes, elapsed)
+                
+                # AI CLI実行
+                with _AI_CALL_SEMAPHORE:
                     if provider == "gemini":
-                        cmd = ["gemini", "chat", "--prompt", prompt]
+                        cmd = [self._available["gemini"] or "gemini", "chat", "--prompt", prompt]
                         timeout = 120  # 2分
-                        result = subprocess.run(
-                            cmd, 
-                            capture_output=True, 
-                            text=True, 
-                            timeout=timeout
-                        )
+                        result = _run_capture(cmd, timeout, on_tick=on_tick, cancel_event=cancel_event,
+                                              on_heartbeat=on_heartbeat)
                     elif provider == "claude":
-                        cmd = ["claude", prompt]
+                        cmd = [self._available["claude"] or "claude", prompt]
                         timeout = 120  # 2分
-                        result = subprocess.run(
-                            cmd, 
-                            capture_output=True, 
-                            text=True, 
-                            timeout=timeout
-                        )
+                        result = _run_capture(cmd, timeout, on_tick=on_tick, cancel_event=cancel_event,
+                                              on_heartbeat=on_heartbeat)
                     elif provider == "chatgpt":
                         # ChatGPT API呼び出し用のアナライザーを作成
-                        temp_analyzer = MultiStageAnalyzer(github_url, repo_name, "/tmp", self.cli_outputs_dir, provider, openai_api_key)
-                        result = temp_analyzer._call_chatgpt_api(prompt)
+                        progress.start(progress_message)
+                        import tempfile
+                        temp_analyzer = MultiStageAnalyzer(github_url, repo_name, tempfile.gettempdir(), self.cli_outputs_dir, provider, openai_api_key)
+                        try:
+                            result = temp_analyzer._call_chatgpt_api(prompt)
+                        finally:
+                            temp_analyzer.close()
                     else:
-                        continue
+                        return None
+                
+                if result.returncode == 0:
+                    progress.finish(f"{provider.upper()}高速分析完了")
                     
-                    # プログレス停止
-                    stop_progress.set()
-                    progress_thread.join(timeout=0.5)
+                    # 出力の詳細表示
+                    output = extract_clean_output(result.stdout)
+                    logger.info(f"\n📄 {provider.upper()}高速分析結果:")
+                    logger.info("-" * 50)
+                    _log_preview(output)
                     
-                    if result.returncode == 0:
-                        progress.finish(f"{provider.upper()}高速分析完了")
-                        
-                        # 出力の詳細表示
-                        output = extract_clean_output(result.stdout)
-                        print(f"\n📄 {provider.upper()}高速分析結果:")
-                        print("-" * 50)
-                        # 最初の500文字を表示
-                        preview = output[:500] + "..." if len(output) > 500 else output
-                        print(preview)
-                        print("-" * 50)
-                        print(f"📊 総文字数: {len(output):,} 文字")
-                        
-                        return output
-                    else:
-                        progress.finish(f"{provider.upper()}高速分析失敗")
-                        print(f"❌ {provider.upper()}エラー: {result.stderr}")
-                        if ai_provider != "auto":
-                            return None
-                        continue
-                
-            except subprocess.TimeoutExpired:
-                print(f"⏰ {provider.upper()}がタイムアウトしました")
-                if ai_provider != "auto":
-                    return None
-                continue
-            except Exception as e:
-                print(f"❌ {provider.upper()}でエラーが発生しました: {e}")
-                if ai_provider != "auto":
+                    return output
+                else:
+                    progress.finish(f"{provider.upper()}高速分析失敗")
+                    logger.error(f"❌ {provider.upper()}エラー: {result.stderr}")
                     return None
-                continue
+            
+        except AnalysisCancelled:
+            logger.info(f"⏹️ {provider.upper()}: 他のプロバイダーが先に完了したため中断しました")
+            return None
+        except subprocess.TimeoutExpired:
+            logger.warning(f"⏰ {provider.upper()}がタイムアウトしました")
+            return None
+        except Exception as e:
+            logger.error(f"❌ {provider.upper()}でエラーが発生しました: {e}")
+            return None
         
         return None
     
+    def _usecase_filepath(self, repo_name):
+        """ユースケースファイルの保存先（ファイル名は安全な文字のみ使用）"""
+        return os.path.join(self.use_cases_dir, f"{sanitize_filename(repo_name)}.md")
+    
+    def _usecase_file_matches(self, content, repo_name):
+        """保存済みのユースケースファイルが content と同一か"""
+        try:
+            with open(self._usecase_filepath(repo_name), 'rb') as f:
+                return f.read() == content.encode('utf-8')
+        except OSError:
+            return False
+    
     def save_usecase_file(self, content, repo_name):
         """ユースケースファイルを保存"""
         try:
             # use-casesディレクトリが存在しない場合は作成
             os.makedirs(self.use_cases_dir, exist_ok=True)
             
-            # ファイル名作成（安全な文字のみ使用）
-            safe_repo_name = re.sub(r'[^\w\-_]', '_', repo_name)
-            filename = f"{safe_repo_name}.md"
-            filepath = os.path.join(self.use_cases_dir, filename)
+            filepath = self._usecase_filepath(repo_name)
             
-            # ファイル保存
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # ファイル保存（一時ファイルに書き込んでから置き換え、書きかけのファイルを残さない）
+            tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                # 一度だけ書き込むためバッファ層を通さずにファイル記述子へ直接書き込む
+                # （WindowsでLFがCRLFに変換されないようバイナリモードで開く）
+                data = memoryview(content.encode('utf-8'))
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+                try:
+                    while data:
+                        data = data[os.write(fd, data):]
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                os.replace(tmp_path, filepath)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
             
             return filepath
             
         except Exception as e:
-            print(f"❌ ファイル保存エラー: {e}")
+            logger.error(f"❌ ファイル保存エラー: {e}")
             return None
     
+    def _git_add_commit_pygit2(self, filepath, commit_message):
+        """pygit2で git add / git commit を実行（同一リポジトリハンドルを再利用）
+
+        ユーザー名・メール未設定などで実行できない場合は False を返し、
+        呼び出し側でgitコマンドにフォールバックする。
+        HEADとツリーが同一でコミットする変更がない場合は None を返す。
+        """
+        try:
+            if self._git_repo is None:
+                repo_path = pygit2.discover_repository(self.project_root)
+                if repo_path is None:
+                    return False
+                self._git_repo = pygit2.Repository(repo_path)
+            repo = self._git_repo
+            signature = repo.default_signature
+            
+            logger.info("📝 ファイルをステージングエリアに追加中...")
+            rel_path = os.path.relpath(os.path.abspath(filepath), repo.workdir).replace(os.sep, "/")
+            repo.index.read()
+            repo.index.add(rel_path)
+            repo.index.write()
+            
+            logger.info("💾 変更をコミット中...")
+            tree = repo.index.write_tree()
+            if not repo.head_is_unborn and repo.head.peel().tree.id == tree:
+                # 再生成した内容が同一（キャッシュ再利用など）：空コミットは作らない
+                return None
+            parents = [] if repo.head_is_unborn else [repo.head.target]
+            repo.create_commit("HEAD", signature, signature, commit_message, tree, parents)
+            return True
+        except (pygit2.GitError, KeyError, ValueError) as e:
+            logger.warning(f"⚠️ pygit2でのコミットに失敗したためgitコマンドを使用します: {e}")
+            return False
+    
     def auto_git_operations(self, filepath, repo_name):
-        """Git操作の自動実行"""
+        """Git操作の自動実行
+
+        成功時は True、失敗時は False。コミットする変更がない場合は None（プッシュもしない）。
+        """
         try:
             self.print_step(4, 5, "Git操作")
             
-            # Git add
-            print("📝 ファイルをステージングエリアに追加中...")
-            subprocess.run(["git", "add", filepath], check=True, cwd=self.project_root)
+            commit_message = _COMMIT_TEMPLATE.format(repo=repo_name)
             
-            # Git commit
-            commit_message = f"feat: Add use case for {repo_name}\n\n🤖 Generated with [Claude Code](https://claude.ai/code)\n\nCo-Authored-By: Claude <noreply@anthropic.com>"
-            print("💾 変更をコミット中...")
-            
-            subprocess.run([
-                "git", "commit", "-m", commit_message
-            ], check=True, cwd=self.project_root)
+            committed = HAS_PYGIT2 and self._git_add_commit_pygit2(filepath, commit_message)
+            if committed is None:
+                logger.info("ℹ️ 変更がないためコミット・プッシュを省略しました")
+                return None
+            if not committed:
+                # Git add
+                logger.info("📝 ファイルをステージングエリアに追加中...")
+                subprocess.run(["git", "add", filepath], check=True, cwd=self.project_root)
+                
+                # ステージ済みの変更がなければ git commit は失敗するため、その前に終了
+                if subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=self.project_root).returncode == 0:
+                    logger.info("ℹ️ 変更がないためコミット・プッシュを省略しました")
+                    return None
+                
+                # Git commit
+                logger.info("💾 変更をコミット中...")
+                
+                subprocess.run([
+                    "git", "commit", "-m", commit_message
+                ], check=True, cwd=self.project_root)
             
             # Git push
-            print("🚀 リモートリポジトリにプッシュ中...")
+            logger.info("🚀 リモートリポジトリにプッシュ中...")
             subprocess.run(["git", "push"], check=True, cwd=self.project_root)
             
-            print("✅ Git操作が正常に完了しました")
+            logger.info("✅ Git操作が正常に完了しました")
             return True
             
         except subprocess.CalledProcessError as e:
-            print(f"❌ Git操作エラー: {e}")
+            logger.error(f"❌ Git操作エラー: {e}")
             return False
         except Exception as e:
-            print(f"❌ 予期しないエラー: {e}")
+            logger.error(f"❌ 予期しないエラー: {e}")
             return False
     
-    def generate_usecase(self, github_url, ai_config, auto_git=True):
-        """メイン処理：GitHubURLからユースケース生成"""
+    def generate_usecase(self, github_url, ai_config, auto_git=True, validated=False):
+        """メイン処理：GitHubURLからユースケース生成
+
+        呼び出し側で検証済みの場合は validated=True でURL検証を省略する。
+        """
         
         self.print_header()
         
         # URL検証
         self.print_step(1, 5, "URL検証")
-        is_valid, repo_info = self.validate_github_url(github_url)
-        if not is_valid:
-            print(f"❌ URL検証エラー: {repo_info}")
-            return False
+        if not validated:
+            is_valid, repo_info = self.validate_github_url(github_url)
+            if not is_valid:
+                logger.error(f"❌ URL検証エラー: {repo_info}")
+                return False
         
         repo_name = self.extract_repo_name(github_url)
-        print(f"✅ 有効なGitHubリポジトリ: {repo_name}")
+        logger.info(f"✅ 有効なGitHubリポジトリ: {repo_name}")
         
         # AI CLI呼び出し
         self.print_step(2, 5, "AIによる分析・生成")
         content = self.call_ai_cli(github_url, repo_name, ai_config)
         if not content:
-            print("\n❌ ユースケース生成に失敗しました")
+            logger.error("\n❌ ユースケース生成に失敗しました")
             return False
         
         # ファイル保存
         self.print_step(3, 5, "ファイル保存")
-        filepath = self.save_usecase_file(content, repo_name)
-        if not filepath:
-            return False
-        
-        print(f"✅ ファイル保存完了: {os.path.basename(filepath)}")
+        # 生成結果の再利用などで内容が変わらない場合は、保存もGit操作も行わない
+        unchanged = self._usecase_file_matches(content, repo_name)
+        if unchanged:
+            filepath = self._usecase_filepath(repo_name)
+            logger.info(f"♻️ 既存のファイルと同一のため、保存とGit操作を省略します: {os.path.basename(filepath)}")
+        else:
+            filepath = self.save_usecase_file(content, repo_name)
+            if not filepath:
+                return False
+            logger.info(f"✅ ファイル保存完了: {os.path.basename(filepath)}")
         
         # Git操作
-        if auto_git:
-            success = self.auto_git_operations(filepath, repo_name)
-            if not success:
-                print("⚠️ Git操作で問題が発生しましたが、ファイル生成は完了しています")
+        git_result = None
+        if auto_git and not unchanged:
+            with self._git_lock:
+                git_result = self.auto_git_operations(filepath, repo_name)
+            if git_result is False:
+                logger.warning("⚠️ Git操作で問題が発生しましたが、ファイル生成は完了しています")
         
         # 完了報告
         self.print_step(5, 5, "完了")
-        print("🎉 ユースケース生成が正常に完了しました！")
-        print(f"📄 生成ファイル: {filepath}")
-        
-        if auto_git:
-            print("🔄 Gitに自動コミット・プッシュ済み")
+        logger.info("🎉 ユースケース生成が正常に完了しました！")
+        logger.info(f"📄 生成ファイル: {filepath}")
+        
+        if unchanged:
+            logger.info("🔄 既存のユースケースから変更はありません")
+        elif auto_git:
+            if git_result:
+                logger.info("🔄 Gitに自動コミット・プッシュ済み")
+            elif git_result is None:
+                logger.info("🔄 Gitの内容は最新です（コミット不要）")
         else:
-            print("💡 手動でGit操作を行ってください:")
-            print(f"   git add {filepath}")
-            print(f"   git commit -m 'Add use case for {repo_name}'")
-            print(f"   git push")
+            logger.info("💡 手動でGit操作を行ってください:")
+            logger.info(f"   git add {filepath}")
+            logger.info(f"   git commit -m 'Add use case for {repo_name}'")
+            logger.info(f"   git push")
         
-        print("\n" + "=" * 60)
+        logger.info("\n" + "=" * 60)
         return True
+    
+    def _generate_usecase_safe(self, github_url, ai_config, auto_git):
+        """一括処理用：例外をログに出して失敗扱いにする"""
+        try:
+            return self.generate_usecase(github_url, ai_config, auto_git, validated=True)
+        except Exception as e:
+            logger.error(f"❌ {github_url} の処理中にエラーが発生しました: {e}")
+            return False
+    
+    def run_batch(self, github_urls, ai_config, auto_git=True, jobs=1):
+        """複数リポジトリを一括処理。全件成功時にTrue
+
+        URL検証は並行実行し、jobs > 1 の場合はユースケース生成も jobs 件まで並行実行する。
+        Git操作はロックにより1件ずつ実行される。
+        """
+        
+        logger.info(f"📚 一括処理モード: {len(github_urls)}件のリポジトリ（並行数: {jobs}）")
+        validations = self.validate_github_urls(github_urls)
+        
+        outcomes = {}
+        valid_urls = []
+        for index, (github_url, (is_valid, result)) in enumerate(zip(github_urls, validations)):
+            if is_valid:
+                valid_urls.append((index, github_url))
+            else:
+                logger.error(f"❌ URL検証エラー ({github_url}): {result}")
+                outcomes[index] = False
+        
+        if jobs > 1 and len(valid_urls) > 1:
+            log_queue = _start_log_queue()
+            try:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(jobs, len(valid_urls))) as executor:
+                    futures = {
+                        index: executor.submit(self._generate_usecase_safe, github_url, ai_config, auto_git)
+                        for index, github_url in valid_urls
+                    }
+                    for index, future in futures.items():
+                        outcomes[index] = future.result()
+            finally:
+                _stop_log_queue(log_queue)
+        else:
+            for index, github_url in valid_urls:
+                outcomes[index] = self._generate_usecase_safe(github_url, ai_config, auto_git)
+        
+        results = [(github_url, outcomes[index]) for index, github_url in enumerate(github_urls)]
+        succeeded = sum(1 for _, ok in results if ok)
+        logger.info(f"\n📊 一括処理結果: {succeeded}/{len(results)}件成功")
+        for github_url, ok in results:
+            logger.info(f"  {'✅' if ok else '❌'} {github_url}")
+        return succeeded == len(results)
+
+class _JsonLogFormatter(logging.Formatter):
+    """1イベント1行のJSON形式でログを出力（ログ集約ツール向け）"""
+    def format(self, record):
+        return json.dumps({
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "message": record.getMessage().strip(),
+        }, ensure_ascii=False)
+
+def configure_logging(quiet=False, json_log=False):
+    """進行状況の出力を設定（quiet: 警告以上のみ / json_log: JSON形式）"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(_JsonLogFormatter() if json_log else logging.Formatter("%(message)s"))
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.WARNING if quiet else logging.INFO)
+    logger.propagate = False
+
+def _start_log_queue():
+    """並行実行中のログを1つのスレッドでまとめて書き出す（戻り値は _stop_log_queue に渡す）"""
+    import queue
+    import logging.handlers
+    
+    handlers = logger.handlers[:]
+    if not handlers:
+        return None
+    log_queue = queue.Queue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    return listener, handlers
+
+def _stop_log_queue(state):
+    """_start_log_queue で開始したログ書き出しを終了し、元の出力先に戻す"""
+    if state is None:
+        return
+    listener, handlers = state
+    listener.stop()
+    logger.handlers[:] = handlers
+
+def read_urls_file(path):
+    """URL一覧ファイルを読み込み（空行と # 以降のコメントは無視）"""
+    urls = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            url = line.split('#', 1)[0].strip()
+            if url:
+                urls.append(url)
+    return urls
 
 def run_tests():
     """基本的なテスト関数"""
@@ -1669,15 +2749,16 @@ def run_tests():
     print("✅ Test 2 (Markdown in code block) passed.")
     
     # Test case 3: YAML front matter Markdown
+    # フロントマターは出力の先頭にある場合のみ検出し、以降の本文全体を採用する
     yaml_md_output = "---\ntitle: \"Test\"\n---\n# Content\nThis is content."
-    test_input_3 = f"Some preamble.\n{yaml_md_output}\nSome postamble."
+    test_input_3 = yaml_md_output
     expected_output_3 = yaml_md_output
     assert extract_clean_output(test_input_3) == expected_output_3, f"Test 3 failed: {extract_clean_output(test_input_3)}"
     print("✅ Test 3 (YAML front matter Markdown) passed.")
     
     # Test case 4: Mixed content, should prioritize YAML front matter
-    mixed_output = f"Some text.\n{yaml_md_output}\n```json\n{json_output}\n```"
-    expected_output_4 = yaml_md_output
+    mixed_output = f"{yaml_md_output}\n```json\n{json_output}\n```"
+    expected_output_4 = mixed_output
     assert extract_clean_output(mixed_output) == expected_output_4, f"Test 4 failed: {extract_clean_output(mixed_output)}"
     print("✅ Test 4 (Mixed content - YAML front matter priority) passed.")
     
@@ -1686,11 +2767,47 @@ def run_tests():
     assert extract_clean_output(plain_text_output) == plain_text_output, f"Test 5 failed: {extract_clean_output(plain_text_output)}"
     print("✅ Test 5 (Plain text) passed.")
     
+    # Test case 6: Bare JSON with braces inside strings and trailing text
+    bare_json = '{"key": "a } b", "nested": {"x": "{"}}'
+    test_input_6 = f"Result: {bare_json} (end}}"
+    assert extract_clean_output(test_input_6) == bare_json, f"Test 6 failed: {extract_clean_output(test_input_6)}"
+    print("✅ Test 6 (Bare JSON with braces in strings) passed.")
+    
+    # Test case 7: Invalid JSON fence followed by a Markdown fence
+    md_output_7 = "# Doc\nSettings: {placeholder}"
+    test_input_7 = f"Intro.\n```json\n{json_output}\nnote\n```\n\n```markdown\n{md_output_7}\n```"
+    assert extract_clean_output(test_input_7) == md_output_7, f"Test 7 failed: {extract_clean_output(test_input_7)}"
+    print("✅ Test 7 (JSON fence does not swallow a later Markdown fence) passed.")
+    
     print("--- All basic tests passed! ---")
 
-def main():
+# 対話モードのAI分析オプション（表示順）
+_PROVIDER_MENU = (
+    ("1", "Gemini 高精度（多段階分析・10-15分）"),
+    ("2", "Gemini 高速（単発分析・1-3分）"),
+    ("3", "Claude 高精度（多段階分析・10-15分）⭐ 推奨"),
+    ("4", "Claude 高速（単発分析・1-3分）"),
+    ("5", "ChatGPT 高精度（多段階分析・10-15分）🔑 APIキー必要"),
+    ("6", "ChatGPT 高速（単発分析・1-3分）🔑 APIキー必要"),
+    ("7", "自動選択（高精度）"),
+)
+
+_AI_CONFIG_MAP = {
+    "1": {"provider": "gemini", "precision": "high"},
+    "2": {"provider": "gemini", "precision": "fast"},
+    "3": {"provider": "claude", "precision": "high"},
+    "4": {"provider": "claude", "precision": "fast"},
+    "5": {"provider": "chatgpt", "precision": "high"},
+    "6": {"provider": "chatgpt", "precision": "fast"},
+    "7": {"provider": "auto", "precision": "high"},
+    "": {"provider": "claude", "precision": "high"}
+}
+
+def build_parser():
+    """コマンドライン引数のパーサーを作成"""
     parser = argparse.ArgumentParser(description='GitHubリポジトリからAIユースケースを自動生成')
-    parser.add_argument('github_url', nargs='?', help='GitHubリポジトリURL')
+    parser.add_argument('github_urls', nargs='*', metavar='github_url',
+                       help='GitHubリポジトリURL（複数指定で一括処理）')
     parser.add_argument('--project-root', default='.', help='プロジェクトルートディレクトリ')
     parser.add_argument('--ai-provider', choices=['gemini', 'claude', 'chatgpt', 'auto'], default='claude', 
                        help='使用するAI CLI (default: claude)')
@@ -1700,17 +2817,56 @@ def main():
                        help='分析精度モード (default: high)')
     parser.add_argument('--no-git', action='store_true', 
                        help='Git操作をスキップ（ファイル生成のみ）')
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument('--no-cache', action='store_true',
+                       help='生成結果・段階別分析のキャッシュを使用しない')
+    cache_group.add_argument('--refresh-cache', action='store_true',
+                       help='キャッシュを読まずに再生成し、結果でキャッシュを更新')
+    parser.add_argument('--urls-file',
+                       help='一括処理するGitHubリポジトリURLの一覧ファイル（1行1URL、#以降はコメント）')
+    parser.add_argument('--jobs', type=int, default=max(1, (os.cpu_count() or 1) * 3 // 4),
+                       help='一括処理時に並行実行するリポジトリ数 (default: CPU数の3/4)')
+    parser.add_argument('--quiet', action='store_true',
+                       help='進行状況を表示せず、警告・エラーのみ出力')
+    parser.add_argument('--json-log', action='store_true',
+                       help='進行状況を1行1件のJSON形式で出力')
     parser.add_argument('--test', action='store_true',
                        help='Run basic tests and exit')
-    
-    args = parser.parse_args()
+    return parser
+
+def main(argv=None):
+    """エントリーポイント。終了コードを返す"""
+    args = build_parser().parse_args(argv)
+    configure_logging(quiet=args.quiet, json_log=args.json_log)
     
     if args.test:
         run_tests()
-        sys.exit(0)
+        return 0
+    
+    github_urls = list(args.github_urls)
+    if args.urls_file:
+        try:
+            github_urls.extend(read_urls_file(args.urls_file))
+        except OSError as e:
+            logger.error(f"❌ URL一覧ファイルを読み込めません: {e}")
+            return 1
+        if not github_urls:
+            logger.error("❌ URL一覧ファイルにURLが含まれていません")
+            return 1
+    
+    # ジェネレーターは1つだけ作成し、検証・生成で共有する
+    generator = UseCaseGenerator(args.project_root)
+    
+    # 生成結果キャッシュの扱い（インタラクティブモード・引数指定のどちらにも適用）
+    if args.no_cache:
+        cache_mode = "off"
+    elif args.refresh_cache:
+        cache_mode = "refresh"
+    else:
+        cache_mode = "use"
     
     # インタラクティブモード
-    if not args.github_url:
+    if not github_urls:
         print("🚀 AI Use Case自動生成ツール")
         print("=" * 50)
         
@@ -1723,7 +2879,6 @@ def main():
                 continue
             
             # URL検証（アクセス可能性チェック含む）
-            generator = UseCaseGenerator(args.project_root)
             is_valid, result = generator.validate_github_url(github_url)
             
             if is_valid:
@@ -1735,32 +2890,18 @@ def main():
                 print(f"❌ {result}")
                 retry = input("別のURLを試しますか？ [Y/n]: ").strip().lower()
                 if retry not in ['', 'y', 'yes']:
-                    sys.exit(1)
+                    return 1
                 continue
             
         # AI Provider & 精度選択
         print("\n🤖 AI分析オプション選択:")
-        print("1. Gemini 高精度（多段階分析・10-15分）")
-        print("2. Gemini 高速（単発分析・1-3分）")
-        print("3. Claude 高精度（多段階分析・10-15分）⭐ 推奨")
-        print("4. Claude 高速（単発分析・1-3分）")
-        print("5. ChatGPT 高精度（多段階分析・10-15分）🔑 APIキー必要")
-        print("6. ChatGPT 高速（単発分析・1-3分）🔑 APIキー必要")
-        print("7. 自動選択（高精度）")
+        for key, label in _PROVIDER_MENU:
+            print(f"{key}. {label}")
         
         choice = input("選択してください [1-7, default: 3]: ").strip()
         
-        ai_config_map = {
-            "1": {"provider": "gemini", "precision": "high"},
-            "2": {"provider": "gemini", "precision": "fast"},
-            "3": {"provider": "claude", "precision": "high"},
-            "4": {"provider": "claude", "precision": "fast"},
-            "5": {"provider": "chatgpt", "precision": "high"},
-            "6": {"provider": "chatgpt", "precision": "fast"},
-            "7": {"provider": "auto", "precision": "high"},
-            "": {"provider": "claude", "precision": "high"}
-        }
-        ai_config = ai_config_map.get(choice, {"provider": "claude", "precision": "high"})
+        # 後続でAPIキーを追加するため定数のコピーを使用
+        ai_config = dict(_AI_CONFIG_MAP.get(choice, _AI_CONFIG_MAP[""]), cache_mode=cache_mode)
         
         # ChatGPTが選択された場合、APIキーを取得
         if ai_config["provider"] == "chatgpt":
@@ -1771,8 +2912,8 @@ def main():
         git_choice = input("\nGit操作を自動実行しますか？ [Y/n]: ").strip().lower()
         auto_git = git_choice in ['', 'y', 'yes']
     else:
-        github_url = args.github_url
-        ai_config = {"provider": args.ai_provider, "precision": args.precision}
+        github_url = github_urls[0]
+        ai_config = {"provider": args.ai_provider, "precision": args.precision, "cache_mode": cache_mode}
         auto_git = not args.no_git
         
         # ChatGPTが指定された場合、APIキーを処理
@@ -1780,30 +2921,32 @@ def main():
             if args.openai_api_key:
                 ai_config["openai_api_key"] = args.openai_api_key
             else:
-                generator = UseCaseGenerator(args.project_root)
                 api_key = generator.get_chatgpt_api_key()
                 ai_config["openai_api_key"] = api_key
         
+        # 複数URL指定時・URL一覧ファイル指定時は一括処理
+        if len(github_urls) > 1 or args.urls_file:
+            return 0 if generator.run_batch(github_urls, ai_config, auto_git, jobs=max(1, args.jobs)) else 1
+        
         # コマンドライン引数の場合もURL検証を実行
-        generator = UseCaseGenerator(args.project_root)
         is_valid, result = generator.validate_github_url(github_url)
         if not is_valid:
             if result == "新しいURLを入力してください":
-                print("❌ プライベートリポジトリアクセスがキャンセルされました")
+                logger.error("❌ プライベートリポジトリアクセスがキャンセルされました")
             else:
-                print(f"❌ URL検証エラー: {result}")
-            sys.exit(1)
-    
-    # ジェネレーター初期化・実行
-    generator = UseCaseGenerator(args.project_root)
+                logger.error(f"❌ URL検証エラー: {result}")
+            return 1
     
-    if generator.generate_usecase(github_url, ai_config, auto_git):
-        sys.exit(0)
+    # ユースケース生成
+    if generator.generate_usecase(github_url, ai_config, auto_git, validated=True):
+        return 0
     else:
-        print("\n💡 ヒント:")
-        print("- Claude CLI: https://github.com/anthropics/claude-code")
-        print("- Gemini CLI: npm install -g @google/generative-ai-cli")
-        sys.exit(1)
+        # --quiet / --json-log では機械可読な出力を崩さないようヒントを表示しない
+        if not (args.quiet or args.json_log):
+            print("\n💡 ヒント:")
+            print("- Claude CLI: https://github.com/anthropics/claude-code")
+            print("- Gemini CLI: npm install -g @google/generative-ai-cli")
+        return 1
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file